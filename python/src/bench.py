@@ -0,0 +1,104 @@
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+Solution = Callable[[str], str | int]
+
+
+class BenchResult(NamedTuple):
+    label: str
+    result: str | int
+    runs: int
+    warmup: int
+    min_ns: int
+    median_ns: float
+    p95_ns: float
+    stddev_ns: float
+    peak_memory_bytes: int
+
+    def to_str(self) -> str:
+        return (
+            f"{self.label}: {self.result} "
+            f"(min {format_ns(self.min_ns)}, median {format_ns(self.median_ns)}, "
+            f"p95 {format_ns(self.p95_ns)}, stddev {format_ns(self.stddev_ns)}, "
+            f"peak mem {format_bytes(self.peak_memory_bytes)}, n={self.runs})"
+        )
+
+
+def format_ns(duration_ns: float) -> str:
+    if duration_ns >= 1e9:
+        return f"{duration_ns / 1e9:.3f}s"
+    elif duration_ns >= 1e6:
+        return f"{duration_ns / 1e6:.3f}ms"
+    else:
+        return f"{duration_ns / 1e3:.3f}us"
+
+
+def format_bytes(num_bytes: int) -> str:
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+
+def percentile(sorted_values: list[int], fraction: float) -> float:
+    """
+    Linearly interpolated percentile of an already-sorted list
+    e.g. fraction=0.95 gives p95
+    """
+    if len(sorted_values) == 1:
+        return float(sorted_values[0])
+    position = fraction * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def measure_peak_memory(solution: Solution, input_text: str) -> int:
+    # tracemalloc slows down allocation-heavy code a lot, so this run is never timed
+    tracemalloc.start()
+    try:
+        solution(input_text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_solution(
+    solution: Solution, input_text: str, label: str, runs: int, warmup: int
+) -> BenchResult:
+    assert runs >= 1, "Need at least one timed run"
+    for _ in range(warmup):
+        solution(input_text)
+
+    durations: list[int] = []
+    result: str | int = ""
+    for _ in range(runs):
+        start_ns = time.perf_counter_ns()
+        result = solution(input_text)
+        durations.append(time.perf_counter_ns() - start_ns)
+
+    durations.sort()
+    return BenchResult(
+        label=label,
+        result=result,
+        runs=runs,
+        warmup=warmup,
+        min_ns=durations[0],
+        median_ns=statistics.median(durations),
+        p95_ns=percentile(durations, 0.95),
+        stddev_ns=statistics.stdev(durations) if runs > 1 else 0.0,
+        peak_memory_bytes=measure_peak_memory(solution, input_text),
+    )
+
+
+def write_json(path: Path, metadata: dict[str, Any], results: list[BenchResult]) -> None:
+    payload = {**metadata, "parts": [result._asdict() for result in results]}
+    path.write_text(json.dumps(payload, indent=2) + "\n")
@@ -0,0 +1,108 @@
+import ast
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import NamedTuple
+
+from runner import INPUTS_DIR, SRC_DIR, Puzzle, get_module_name
+
+CACHE_PATH = INPUTS_DIR / ".cache" / "results.sqlite3"
+
+
+class CacheKey(NamedTuple):
+    year: int
+    day: int
+    part: int
+    input_hash: str
+    source_hash: str
+
+
+def sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def module_path(module_name: str) -> Path | None:
+    """Path of a module that lives in this source tree, or None (e.g. stdlib, numpy)"""
+    base = SRC_DIR.joinpath(*module_name.split("."))
+    for path in (base.with_suffix(".py"), base / "__init__.py"):
+        if path.exists():
+            return path
+    return None
+
+
+def local_imports(path: Path) -> set[str]:
+    names: set[str] = set()
+    for node in ast.walk(ast.parse(path.read_text())):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module is not None and node.level == 0:
+            names.add(node.module)
+    return {name for name in names if module_path(name) is not None}
+
+
+def get_source_hash(puzzle: Puzzle) -> str:
+    """
+    Hash of the solution module's source together with any modules from this source tree
+    that it (transitively) imports, so that editing a shared helper invalidates its users
+    """
+    to_visit = [get_module_name(puzzle)]
+    seen: set[str] = set()
+    while to_visit:
+        name = to_visit.pop()
+        if name not in seen:
+            seen.add(name)
+            path = module_path(name)
+            assert path is not None, f"Could not find source for {name}"
+            to_visit.extend(local_imports(path))
+
+    digest = hashlib.sha256()
+    for name in sorted(seen):
+        path = module_path(name)
+        assert path is not None
+        digest.update(name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Answers previously computed for a given input and solution source, stored in SQLite"""
+
+    def __init__(self, path: Path = CACHE_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                year INTEGER,
+                day INTEGER,
+                part INTEGER,
+                input_hash TEXT,
+                source_hash TEXT,
+                result TEXT,
+                duration REAL,
+                PRIMARY KEY (year, day, part, input_hash, source_hash)
+            )
+            """
+        )
+
+    def get(self, key: CacheKey) -> tuple[str | int, float] | None:
+        """Returns the cached result and how long it originally took to compute, if present"""
+        row = self.connection.execute(
+            "SELECT result, duration FROM results WHERE year=? AND day=? AND part=?"
+            " AND input_hash=? AND source_hash=?",
+            key,
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: CacheKey, result: str | int, duration: float) -> None:
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*key, json.dumps(result if isinstance(result, str) else int(result)), duration),
+            )
+
+    def close(self) -> None:
+        self.connection.close()
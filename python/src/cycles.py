@@ -0,0 +1,94 @@
+"""
+Shared cycle detection for simulations that eventually repeat
+
+Both helpers use Brent's algorithm, which compares each new state against a single saved
+"tortoise" (moved up to the current state whenever the step count hits a power of two),
+so they never store the history of the simulation.
+
+States are compared by a caller-supplied fingerprint, which must capture everything that
+determines future steps (e.g. the top rows of a tower rather than the whole tower).
+"""
+from collections.abc import Callable, Hashable
+from typing import NamedTuple, TypeVar
+
+State = TypeVar("State")
+
+
+class Cycle(NamedTuple):
+    start: int  # Number of steps before first entering the cycle
+    length: int
+
+
+def _find_length(
+    state: State, step: Callable[[State], State], fingerprint: Callable[[State], Hashable]
+) -> int:
+    """Length of the cycle, found by stepping until a fingerprint repeats"""
+    tortoise = fingerprint(state)
+    power = length = 1
+    state = step(state)
+    while (hare := fingerprint(state)) != tortoise:
+        if power == length:
+            tortoise = hare
+            power *= 2
+            length = 0
+        state = step(state)
+        length += 1
+    return length
+
+
+def find_cycle(
+    initial: State,
+    step: Callable[[State], State],
+    fingerprint: Callable[[State], Hashable] = lambda state: state,
+) -> Cycle:
+    """
+    Finds where the sequence initial, step(initial), step(step(initial)), ... starts repeating
+    Finding the start replays the simulation from the beginning, so step must not mutate
+    """
+    length = _find_length(initial, step, fingerprint)
+
+    # Walk two states `length` apart forward together until they match
+    behind, ahead = initial, initial
+    for _ in range(length):
+        ahead = step(ahead)
+    start = 0
+    while fingerprint(behind) != fingerprint(ahead):
+        behind, ahead = step(behind), step(ahead)
+        start += 1
+    return Cycle(start, length)
+
+
+def fast_forward(
+    initial: State,
+    step: Callable[[State], State],
+    num_steps: int,
+    fingerprint: Callable[[State], Hashable],
+    measure: Callable[[State], int],
+) -> int:
+    """
+    The measure of the state after num_steps steps, where the measure (e.g. a tower's height)
+    grows by the same amount every time around the cycle. Simulates until the cycle is found,
+    skips all the whole cycles that remain, then simulates what's left of a partial cycle.
+    step may mutate the state in place, since states are never revisited.
+    """
+    tortoise = fingerprint(initial)
+    tortoise_measure = measure(initial)
+    power = length = 1
+    state = initial
+    for steps_taken in range(1, num_steps + 1):
+        state = step(state)
+        if (hare := fingerprint(state)) == tortoise:
+            break
+        if power == length:
+            tortoise, tortoise_measure = hare, measure(state)
+            power *= 2
+            length = 0
+        length += 1
+    else:
+        return measure(state)  # Finished before finding a cycle
+
+    num_cycles, remainder = divmod(num_steps - steps_taken, length)
+    skipped = num_cycles * (measure(state) - tortoise_measure)
+    for _ in range(remainder):
+        state = step(state)
+    return measure(state) + skipped
@@ -0,0 +1,3 @@
+from grid.grid import Grid
+
+__all__ = ["Grid"]
@@ -0,0 +1,125 @@
+import copy
+from collections.abc import Iterator
+
+from typing_extensions import Self
+
+
+class Grid:
+    """
+    Rectangular grid of single-character cells, stored row-major in a flat bytearray
+    Cells are addressed by integer index, and moving between cells is just adding an offset,
+    so hot loops never construct coordinate objects.
+
+    The grid is surrounded by `padding` layers of `border` cells, so walking off the edge
+    lands on a border cell rather than out of range (or wrapping onto another row).
+    """
+
+    __slots__ = (
+        "num_rows",
+        "num_cols",
+        "padding",
+        "width",
+        "cells",
+        "orthogonal_offsets",
+        "neighbor_offsets",
+    )
+
+    def __init__(
+        self, num_rows: int, num_cols: int, fill: str = ".", padding: int = 1, border: str = " "
+    ):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.padding = padding
+        self.width = num_cols + 2 * padding
+        self.cells = bytearray(border.encode()) * (self.width * (num_rows + 2 * padding))
+        fill_row = fill.encode() * num_cols
+        for row in range(num_rows):
+            start = self.index(row, 0)
+            self.cells[start : start + num_cols] = fill_row
+
+        # Clockwise starting from up, so that turning right is (direction + 1) % 4
+        self.orthogonal_offsets: tuple[int, int, int, int] = (-self.width, 1, self.width, -1)
+        # All eight neighbors, clockwise starting from up
+        up, right, down, left = self.orthogonal_offsets
+        self.neighbor_offsets: tuple[int, ...] = (
+            up,
+            up + right,
+            right,
+            down + right,
+            down,
+            down + left,
+            left,
+            up + left,
+        )
+
+    @classmethod
+    def from_text(cls, text: str, padding: int = 1, border: str = " ") -> Self:
+        lines = text.split("\n")
+        grid = cls(len(lines), len(lines[0]), padding=padding, border=border)
+        for row, line in enumerate(lines):
+            assert len(line) == grid.num_cols, f"Line {row} has length {len(line)}"
+            start = grid.index(row, 0)
+            grid.cells[start : start + grid.num_cols] = line.encode()
+        return grid
+
+    def __str__(self) -> str:
+        return "\n".join(
+            self.cells[self.index(row, 0) : self.index(row, self.num_cols)].decode()
+            for row in range(self.num_rows)
+        )
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __setitem__(self, index: int, value: int) -> None:
+        self.cells[index] = value
+
+    def copy(self) -> Self:
+        """Copy with its own cells, keeping any attributes added by subclasses"""
+        grid = copy.copy(self)
+        grid.cells = self.cells[:]
+        return grid
+
+    def index(self, row: int, col: int) -> int:
+        return (row + self.padding) * self.width + col + self.padding
+
+    def row_col(self, index: int) -> tuple[int, int]:
+        row, col = divmod(index, self.width)
+        return row - self.padding, col - self.padding
+
+    def in_bounds(self, index: int) -> bool:
+        row, col = self.row_col(index)
+        return 0 <= row < self.num_rows and 0 <= col < self.num_cols
+
+    def indices(self) -> Iterator[int]:
+        """Indices of all cells within the grid (excluding the border), in row-major order"""
+        for row in range(self.num_rows):
+            start = self.index(row, 0)
+            yield from range(start, start + self.num_cols)
+
+    def find(self, char: str) -> int:
+        """Index of the first cell with the given character"""
+        value = char.encode()
+        for row in range(self.num_rows):
+            start = self.index(row, 0)
+            if (index := self.cells.find(value, start, start + self.num_cols)) != -1:
+                return index
+        raise ValueError(f"{char!r} is not in the grid")
+
+    def find_all(self, char: str) -> list[int]:
+        value = ord(char)
+        return [index for index in self.indices() if self.cells[index] == value]
+
+    def manhattan_offsets(self, max_dist: int) -> list[tuple[int, int]]:
+        """
+        (offset, distance) pairs for every cell within max_dist steps, excluding the origin
+        A padding of at least max_dist keeps origin + offset in range for every cell in the grid
+        """
+        offsets: list[tuple[int, int]] = []
+        for row_offset in range(-max_dist, max_dist + 1):
+            remaining = max_dist - abs(row_offset)
+            for col_offset in range(-remaining, remaining + 1):
+                if row_offset or col_offset:
+                    offset = row_offset * self.width + col_offset
+                    offsets.append((offset, abs(row_offset) + abs(col_offset)))
+        return offsets
@@ -1,63 +1,236 @@
 import argparse
-import importlib
+import os
+import sys
 import time
 from pathlib import Path
-from typing import Callable, NamedTuple
+from typing import NamedTuple
 
-Solution = Callable[[str], str | int]
+import bench
+import cache
+import runner
+import sweep
+import verify
+from runner import Puzzle, Solution
 
 
 class Args(NamedTuple):
-    year: int
-    day: int
+    year: int | None
+    day: int | None
     example: bool
+    bench: int | None
+    warmup: int
+    json_path: Path | None
+    all: bool
+    jobs: int
+    timeout: float | None
+    no_cache: bool
+    refresh: bool
+    verify: bool
+    regression_ratio: float | None
+    record_baseline: bool
 
 
 def parse_args() -> Args:
     parser = argparse.ArgumentParser("Advent of Code")
-    parser.add_argument("-y", "--year", dest="year", type=int)
+    parser.add_argument(
+        "-y", "--year", dest="year", type=int, help="Without --day, runs every day of the year"
+    )
     parser.add_argument("-d", "--day", dest="day", type=int)
     parser.add_argument("-e", "--example", dest="example", action="store_true")
+    parser.add_argument(
+        "--bench",
+        dest="bench",
+        type=int,
+        metavar="N",
+        help="Time each part over N runs and report statistics",
+    )
+    parser.add_argument(
+        "--warmup", dest="warmup", type=int, default=1, help="Untimed runs before --bench runs"
+    )
+    parser.add_argument(
+        "--json", dest="json_path", type=Path, help="Write --bench results as JSON to this path"
+    )
+    parser.add_argument("--all", dest="all", action="store_true", help="Run every year and day")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for --all/--year sweeps",
+    )
+    parser.add_argument(
+        "--timeout",
+        dest="timeout",
+        type=float,
+        default=120.0,
+        help="Per-part timeout in seconds for sweeps (0 for none)",
+    )
+    parser.add_argument(
+        "--no-cache", dest="no_cache", action="store_true", help="Neither read nor write cache"
+    )
+    parser.add_argument(
+        "--refresh",
+        dest="refresh",
+        action="store_true",
+        help="Recompute answers even if cached, then update the cache",
+    )
+    parser.add_argument(
+        "--verify",
+        dest="verify",
+        action="store_true",
+        help="Check answers in the manifest (optionally filtered by --year/--day)",
+    )
+    parser.add_argument(
+        "--regression-ratio",
+        dest="regression_ratio",
+        type=float,
+        nargs="?",
+        const=verify.DEFAULT_REGRESSION_RATIO,
+        metavar="RATIO",
+        help=(
+            "With --verify, flag parts slower than RATIO (default "
+            f"{verify.DEFAULT_REGRESSION_RATIO}) times their baseline runtime"
+        ),
+    )
+    parser.add_argument(
+        "--record-baseline",
+        dest="record_baseline",
+        action="store_true",
+        help="With --verify, store measured runtimes of correct answers as new baselines",
+    )
     args = parser.parse_args()
-    return Args(year=args.year, day=args.day, example=args.example)
-
-
-def get_input(args: Args, part: int) -> str:
-    input_dir = Path(__file__).parent.parent.parent / "inputs" / f"year{args.year:04d}"
-
-    # Try version with suffix e.g. _p1 first, fallback on normal version
-    filename = (
-        f"example{args.day:02d}_p{part}.txt" if args.example else f"day{args.day:02d}_p{part}.txt"
+    is_sweep = args.all or args.day is None
+    if args.record_baseline and not args.verify:
+        parser.error("--record-baseline requires --verify")
+    if args.verify and (args.all or args.example or args.bench is not None):
+        parser.error("--verify cannot be combined with --all, --example or --bench")
+    if not args.verify and not args.all and args.year is None:
+        parser.error("Either --year or --all is required")
+    if args.all and (args.year is not None or args.day is not None):
+        parser.error("--all cannot be combined with --year/--day")
+    if is_sweep and (args.example or args.bench is not None):
+        parser.error("--example and --bench only apply to a single day")
+    if args.bench is not None and args.bench < 1:
+        parser.error("--bench requires at least one run")
+    if args.json_path is not None and args.bench is None:
+        parser.error("--json requires --bench")
+    if args.no_cache and args.refresh:
+        parser.error("--no-cache and --refresh are mutually exclusive")
+    return Args(
+        year=args.year,
+        day=args.day,
+        example=args.example,
+        bench=args.bench,
+        warmup=args.warmup,
+        json_path=args.json_path,
+        all=args.all,
+        jobs=args.jobs,
+        timeout=args.timeout or None,
+        no_cache=args.no_cache,
+        refresh=args.refresh,
+        verify=args.verify,
+        regression_ratio=args.regression_ratio,
+        record_baseline=args.record_baseline,
     )
-    path = input_dir / filename
-    if not path.exists():
-        # Try without _p1 / _p2 suffix
-        filename = f"example{args.day:02d}.txt" if args.example else f"day{args.day:02d}.txt"
-        path = input_dir / filename
 
-    return path.read_text().rstrip("\n")
 
+def run_solution(
+    solution: Solution,
+    input_text: str,
+    label: str,
+    result_cache: cache.ResultCache | None = None,
+    cache_key: cache.CacheKey | None = None,
+    refresh: bool = False,
+) -> None:
+    if result_cache is not None and cache_key is not None and not refresh:
+        if (hit := result_cache.get(cache_key)) is not None:
+            result, duration = hit
+            print(f"{label}: {result} (cached, originally in {duration:.3f}s)")
+            return
 
-def get_implementation(args: Args) -> tuple[Solution, Solution]:
-    solution_module = importlib.import_module(f"year{args.year:04d}.day{args.day:02d}.solution")
-    return getattr(solution_module, "part_1"), getattr(solution_module, "part_2")
-
-
-def run_solution(solution: Solution, input_text: str, label: str) -> None:
     start_time = time.time()
     result = solution(input_text)
     duration = time.time() - start_time
     print(f"{label}: {result} (in {duration:.3f}s)")
+    if result_cache is not None and cache_key is not None:
+        result_cache.put(cache_key, result, duration)
+
+
+def open_cache(args: Args) -> cache.ResultCache | None:
+    return None if args.no_cache else cache.ResultCache()
+
+
+def run_day(args: Args, puzzle: Puzzle) -> None:
+    part1_input = runner.get_input(puzzle, 1, args.example)
+    part2_input = runner.get_input(puzzle, 2, args.example)
+    part1, part2 = runner.get_implementation(puzzle)
+
+    print(f"{'[EXAMPLE] ' if args.example else ''}Running {puzzle}")
+    if args.bench is None:
+        result_cache = open_cache(args)
+        source_hash = cache.get_source_hash(puzzle)
+        for part, solution, input_text in ((1, part1, part1_input), (2, part2, part2_input)):
+            key = cache.CacheKey(
+                puzzle.year, puzzle.day, part, cache.sha256(input_text), source_hash
+            )
+            run_solution(solution, input_text, f"Part {part}", result_cache, key, args.refresh)
+        return
+
+    results = [
+        bench.bench_solution(part1, part1_input, "Part 1", args.bench, args.warmup),
+        bench.bench_solution(part2, part2_input, "Part 2", args.bench, args.warmup),
+    ]
+    for result in results:
+        print(result.to_str())
+    if args.json_path is not None:
+        metadata = {"year": puzzle.year, "day": puzzle.day, "example": args.example}
+        bench.write_json(args.json_path, metadata, results)
+
+
+def run_sweep(args: Args) -> None:
+    puzzles = runner.discover_puzzles(None if args.all else args.year)
+    print(f"Running {len(puzzles)} days with {args.jobs} jobs")
+    start_time = time.time()
+    outcomes = sweep.run_sweep(puzzles, args.jobs, args.timeout, open_cache(args), args.refresh)
+    wall_time = time.time() - start_time
+
+    print(sweep.format_table(outcomes))
+    computed = [outcome for outcome in outcomes if not outcome.cached]
+    total_time = sum(outcome.duration for outcome in computed)
+    print(
+        f"Computed {len(computed)}/{len(outcomes)} parts: total solution time {total_time:.3f}s, "
+        f"wall-clock time {wall_time:.3f}s"
+    )
+
+
+def run_verify(args: Args) -> bool:
+    expectations = [
+        expectation
+        for expectation in verify.load_manifest()
+        if args.year in (None, expectation.year) and args.day in (None, expectation.day)
+    ]
+    print(f"Verifying {len(expectations)} answers with {args.jobs} jobs")
+    checks = verify.run_checks(expectations, args.jobs, args.timeout)
+    print(verify.format_report(checks, args.regression_ratio))
+
+    failures = [check for check in checks if check.status(args.regression_ratio) != "ok"]
+    print(f"{len(checks) - len(failures)}/{len(checks)} ok")
+    if args.record_baseline:
+        print(f"Recorded {verify.record_baselines(checks)} baselines")
+    return not failures
 
 
 def main():
     args = parse_args()
-    part1_input, part2_input = get_input(args, 1), get_input(args, 2)
-    part1, part2 = get_implementation(args)
-
-    print(f"{'[EXAMPLE] 'if args.example else ''}Running {args.year} Day {args.day:02d}")
-    run_solution(part1, part1_input, "Part 1")
-    run_solution(part2, part2_input, "Part 2")
+    if args.verify:
+        if not run_verify(args):
+            sys.exit(1)
+    elif args.all or args.day is None:
+        run_sweep(args)
+    else:
+        assert args.year is not None
+        run_day(args, Puzzle(args.year, args.day))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+"""
+Shared multi-pattern string matching with an Aho-Corasick automaton
+
+The patterns go into a trie, and each trie node gets a failure link to the node for the longest
+proper suffix of its string that is also in the trie. Scanning text then never backs up, so
+finding every match of every pattern takes O(len(text) + number of matches), however many
+patterns there are.
+"""
+from collections import deque
+from collections.abc import Iterable, Iterator
+
+
+class Matcher:
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(patterns)
+        self.lengths = [len(pattern) for pattern in self.patterns]
+        # Node 0 is the root. Each node has its children, its failure link, the patterns that
+        # end exactly there, and a link to the nearest node along failure links with a pattern
+        self._children: list[dict[str, int]] = [{}]
+        self._fail = [0]
+        self._ends: list[list[int]] = [[]]
+        self._output_link = [0]
+
+        for pattern_idx, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("Patterns must be non-empty")
+            node = 0
+            for char in pattern:
+                if (child := self._children[node].get(char)) is None:
+                    child = len(self._children)
+                    self._children[node][char] = child
+                    self._children.append({})
+                    self._fail.append(0)
+                    self._ends.append([])
+                    self._output_link.append(0)
+                node = child
+            self._ends[node].append(pattern_idx)
+
+        # Breadth first, so failure links always point to nodes that are already linked
+        queue = deque(self._children[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._children[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._children[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._children[fail].get(char, 0)
+                fail = self._fail[child]
+                self._output_link[child] = fail if self._ends[fail] else self._output_link[fail]
+                queue.append(child)
+
+    def find_all(self, text: str) -> Iterator[tuple[int, int]]:
+        """
+        Yields (start index, pattern index) for every occurrence of every pattern in the text
+        Matches come in order of where they end, so a match's start has been passed already
+        """
+        children, fail, ends = self._children, self._fail, self._ends
+        output_link, lengths = self._output_link, self.lengths
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in children[node]:
+                node = fail[node]
+            node = children[node].get(char, 0)
+            match_node = node if ends[node] else output_link[node]
+            while match_node:
+                for pattern_idx in ends[match_node]:
+                    yield end - lengths[pattern_idx], pattern_idx
+                match_node = output_link[match_node]
+
+    def matches_by_start(self, text: str) -> list[list[int]]:
+        """For each index in the text, the indices of the patterns that start there"""
+        matches: list[list[int]] = [[] for _ in text]
+        for start, pattern_idx in self.find_all(text):
+            matches[start].append(pattern_idx)
+        return matches
@@ -0,0 +1,63 @@
+"""
+Shared process pool fan-out for solutions that split independent work across cores
+
+Starting a pool costs tens of milliseconds, so work is only split when every job gets at least a
+caller-chosen number of items. Below that, everything runs in this process.
+
+Functions are sent to worker processes, so they must be defined at module level (optionally
+wrapped in functools.partial for fixed arguments).
+"""
+import functools
+import multiprocessing
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import TypeVar
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+def get_num_jobs(num_items: int, min_items_per_job: int, jobs: int | None = None) -> int:
+    """
+    Number of worker processes to split num_items across, or 1 to run in this process
+    jobs defaults to the number of cores. Inside a pool worker (e.g. a --all sweep), this is always
+    1 so that pools are never nested.
+    """
+    if multiprocessing.parent_process() is not None:
+        return 1
+    jobs = jobs or os.cpu_count() or 1
+    return max(1, min(jobs, num_items // min_items_per_job))
+
+
+def map_in_chunks(
+    fn: Callable[[Sequence[Item]], Result],
+    items: Sequence[Item],
+    min_items_per_job: int,
+    jobs: int | None = None,
+) -> list[Result]:
+    """
+    fn applied to each chunk of items, one chunk per job
+    Chunk idx holds every jobs-th item starting from idx, so slicing a range gives a range, and
+    work that gets slower along the sequence is shared evenly.
+    """
+    jobs = get_num_jobs(len(items), min_items_per_job, jobs)
+    if jobs <= 1:
+        return [fn(items)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(fn, [items[idx::jobs] for idx in range(jobs)]))
+
+
+def _map_chunk(fn: Callable[[Item], Result], chunk: Sequence[Item]) -> list[Result]:
+    return [fn(item) for item in chunk]
+
+
+def map_items(
+    fn: Callable[[Item], Result],
+    items: Sequence[Item],
+    min_items_per_job: int,
+    jobs: int | None = None,
+) -> list[Result]:
+    """fn applied to every item, in the same order as items"""
+    chunks = map_in_chunks(functools.partial(_map_chunk, fn), items, min_items_per_job, jobs)
+    return [chunks[idx % len(chunks)][idx // len(chunks)] for idx in range(len(items))]
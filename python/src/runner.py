@@ -0,0 +1,74 @@
+import ast
+import importlib
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+Solution = Callable[[str], str | int]
+
+SRC_DIR = Path(__file__).parent
+INPUTS_DIR = SRC_DIR.parent.parent / "inputs"
+
+
+class Puzzle(NamedTuple):
+    year: int
+    day: int
+
+    def __str__(self) -> str:
+        return f"{self.year} Day {self.day:02d}"
+
+
+def get_input_path(puzzle: Puzzle, part: int, example: bool) -> Path:
+    input_dir = INPUTS_DIR / f"year{puzzle.year:04d}"
+
+    # Try version with suffix e.g. _p1 first, fallback on normal version
+    stem = f"example{puzzle.day:02d}" if example else f"day{puzzle.day:02d}"
+    path = input_dir / f"{stem}_p{part}.txt"
+    if not path.exists():
+        # Try without _p1 / _p2 suffix
+        path = input_dir / f"{stem}.txt"
+    return path
+
+
+def read_input(path: Path) -> str:
+    return path.read_text().rstrip("\n")
+
+
+def get_input(puzzle: Puzzle, part: int, example: bool) -> str:
+    return read_input(get_input_path(puzzle, part, example))
+
+
+def get_module_name(puzzle: Puzzle) -> str:
+    return f"year{puzzle.year:04d}.day{puzzle.day:02d}.solution"
+
+
+def get_implementation(puzzle: Puzzle) -> tuple[Solution, Solution]:
+    solution_module = importlib.import_module(get_module_name(puzzle))
+    return getattr(solution_module, "part_1"), getattr(solution_module, "part_2")
+
+
+def defines_parts(source_path: Path) -> bool:
+    """
+    Check (without importing) whether a solution module defines part_1 and part_2
+    Parsing rather than importing keeps old, non-Python-3 code out of the picture
+    """
+    try:
+        tree = ast.parse(source_path.read_text())
+    except SyntaxError:
+        return False
+    names = {node.name for node in tree.body if isinstance(node, ast.FunctionDef)}
+    return {"part_1", "part_2"} <= names
+
+
+def discover_puzzles(year: int | None = None) -> list[Puzzle]:
+    """
+    Find every yearYYYY/dayDD/solution.py that main.py can run i.e. that defines
+    part_1/part_2 and has a puzzle input in the inputs directory
+    """
+    puzzles: list[Puzzle] = []
+    year_glob = f"year{year:04d}" if year is not None else "year[0-9][0-9][0-9][0-9]"
+    for source_path in sorted(SRC_DIR.glob(f"{year_glob}/day[0-9][0-9]/solution.py")):
+        puzzle = Puzzle(int(source_path.parent.parent.name[4:]), int(source_path.parent.name[3:]))
+        has_input = all(get_input_path(puzzle, part, False).exists() for part in (1, 2))
+        if has_input and defines_parts(source_path):
+            puzzles.append(puzzle)
+    return puzzles
@@ -0,0 +1,169 @@
+"""
+Shared graph search over integer-encoded states
+
+Callers pack whatever a node is (position, heading, time, ...) into a single int, which keeps
+hashing, heap comparisons and predecessor bookkeeping cheap. Neighbor functions return
+neighboring states (for unweighted searches) or (state, cost) pairs (for weighted searches).
+"""
+from collections import deque
+from collections.abc import Callable, Iterable
+from heapq import heappop, heappush
+from typing import NamedTuple
+
+Neighbors = Callable[[int], Iterable[int]]
+WeightedNeighbors = Callable[[int], Iterable[tuple[int, int]]]
+IsGoal = Callable[[int], bool]
+Heuristic = Callable[[int], int]
+
+
+class SearchResult(NamedTuple):
+    cost: int  # Cost of the cheapest path to a goal
+    goals: list[int]  # Goal states reached at that cost
+    distances: dict[int, int]  # Best known cost to every state reached
+    predecessors: dict[int, list[int]]  # Previous state(s) on cheapest paths to each state
+
+    def path(self, goal: int | None = None) -> list[int]:
+        """One cheapest path to the goal (defaulting to the first goal found), start first"""
+        state = self.goals[0] if goal is None else goal
+        path = [state]
+        while previous := self.predecessors.get(state):
+            state = previous[0]
+            path.append(state)
+        path.reverse()
+        return path
+
+    def states_on_shortest_paths(self) -> set[int]:
+        """
+        All states on any cheapest path to any of the goals
+        Only complete when the search was run with all_predecessors=True
+        """
+        states = set(self.goals)
+        to_visit = list(self.goals)
+        while to_visit:
+            for previous in self.predecessors.get(to_visit.pop(), ()):
+                if previous not in states:
+                    states.add(previous)
+                    to_visit.append(previous)
+        return states
+
+
+def bfs(starts: Iterable[int], get_neighbors: Neighbors, is_goal: IsGoal) -> SearchResult | None:
+    """Breadth first search where every step costs 1, returns None if no goal is reachable"""
+    distances: dict[int, int] = {}
+    predecessors: dict[int, list[int]] = {}
+    queue: deque[int] = deque()
+    for start in starts:
+        if start not in distances:
+            distances[start] = 0
+            queue.append(start)
+
+    while queue:
+        state = queue.popleft()
+        if is_goal(state):
+            return SearchResult(distances[state], [state], distances, predecessors)
+
+        next_distance = distances[state] + 1
+        for neighbor in get_neighbors(state):
+            if neighbor not in distances:
+                distances[neighbor] = next_distance
+                predecessors[neighbor] = [state]
+                queue.append(neighbor)
+    return None
+
+
+def zero_one_bfs(
+    starts: Iterable[int], get_neighbors: WeightedNeighbors, is_goal: IsGoal
+) -> SearchResult | None:
+    """Search where every step costs 0 or 1, using a deque instead of a heap"""
+    distances: dict[int, int] = {}
+    predecessors: dict[int, list[int]] = {}
+    expanded: set[int] = set()
+    queue: deque[int] = deque()
+    for start in starts:
+        distances[start] = 0
+        queue.append(start)
+
+    while queue:
+        state = queue.popleft()
+        if state in expanded:
+            continue  # Stale entry, the state was reached more cheaply since it was queued
+        expanded.add(state)
+        if is_goal(state):
+            return SearchResult(distances[state], [state], distances, predecessors)
+
+        for neighbor, cost in get_neighbors(state):
+            neighbor_distance = distances[state] + cost
+            known_distance = distances.get(neighbor)
+            if known_distance is None or neighbor_distance < known_distance:
+                distances[neighbor] = neighbor_distance
+                predecessors[neighbor] = [state]
+                if cost == 0:
+                    queue.appendleft(neighbor)
+                else:
+                    queue.append(neighbor)
+    return None
+
+
+def dijkstra(
+    starts: Iterable[int],
+    get_neighbors: WeightedNeighbors,
+    is_goal: IsGoal,
+    heuristic: Heuristic | None = None,
+    all_predecessors: bool = False,
+) -> SearchResult | None:
+    """
+    Dijkstra's algorithm with lazy deletion: rather than decreasing a key in the heap, a state
+    is pushed again with its lower cost and stale heap entries are skipped when popped.
+
+    With a heuristic this is A*. The heuristic must never overestimate the remaining cost,
+    and must be consistent if all_predecessors is set.
+
+    With all_predecessors, every predecessor on a cheapest path is kept, and the search runs
+    until all goal states at the minimal cost have been found.
+    """
+    distances: dict[int, int] = {}
+    predecessors: dict[int, list[int]] = {}
+    expanded: set[int] = set()
+    heap: list[tuple[int, int, int]] = []  # (cost + heuristic, cost, state)
+    for start in starts:
+        distances[start] = 0
+        heappush(heap, (heuristic(start) if heuristic else 0, 0, start))
+
+    goals: list[int] = []
+    while heap:
+        priority, cost, state = heappop(heap)
+        if state in expanded or cost > distances[state]:
+            continue  # Stale entry
+        if goals and priority > distances[goals[0]]:
+            break  # Nothing left in the heap can reach a goal as cheaply as those already found
+        expanded.add(state)
+        if is_goal(state):
+            goals.append(state)
+            if not all_predecessors:
+                break
+            continue
+
+        for neighbor, step_cost in get_neighbors(state):
+            neighbor_cost = cost + step_cost
+            known_cost = distances.get(neighbor)
+            if known_cost is None or neighbor_cost < known_cost:
+                distances[neighbor] = neighbor_cost
+                predecessors[neighbor] = [state]
+                neighbor_priority = neighbor_cost + (heuristic(neighbor) if heuristic else 0)
+                heappush(heap, (neighbor_priority, neighbor_cost, neighbor))
+            elif all_predecessors and neighbor_cost == known_cost and neighbor not in expanded:
+                predecessors.setdefault(neighbor, []).append(state)
+
+    if not goals:
+        return None
+    return SearchResult(distances[goals[0]], goals, distances, predecessors)
+
+
+def astar(
+    starts: Iterable[int],
+    get_neighbors: WeightedNeighbors,
+    is_goal: IsGoal,
+    heuristic: Heuristic,
+    all_predecessors: bool = False,
+) -> SearchResult | None:
+    return dijkstra(starts, get_neighbors, is_goal, heuristic, all_predecessors)
@@ -0,0 +1,134 @@
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import runner
+from cache import CacheKey, ResultCache, get_source_hash, sha256
+from runner import Puzzle
+
+
+class Task(NamedTuple):
+    puzzle: Puzzle
+    part: int
+    input_path: Path
+    timeout: float | None
+
+
+class Outcome(NamedTuple):
+    puzzle: Puzzle
+    part: int
+    result: str | int | None
+    duration: float
+    error: str | None = None
+    cached: bool = False
+
+    def result_str(self) -> str:
+        if self.error is not None:
+            return self.error
+        lines = str(self.result).strip("\n").split("\n")
+        return lines[0] if len(lines) == 1 else f"<{len(lines)} lines>"
+
+
+class TaskTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise TaskTimeout()
+
+
+def run_task(task: Task) -> Outcome:
+    """
+    Run a single part of a single day, meant to be called in a worker process
+    The timeout is enforced with SIGALRM within the worker, so a stuck day doesn't
+    hold up the rest of the sweep (where SIGALRM is unavailable, there is no timeout)
+    Importing the solution and reading its input are neither timed nor subject to the timeout
+    """
+    use_alarm = task.timeout is not None and hasattr(signal, "SIGALRM")
+    start_time = time.perf_counter()
+    try:
+        solution = runner.get_implementation(task.puzzle)[task.part - 1]
+        puzzle_input = runner.read_input(task.input_path)
+        start_time = time.perf_counter()
+        if use_alarm:
+            assert task.timeout is not None
+            signal.signal(signal.SIGALRM, _raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, task.timeout)
+        result = solution(puzzle_input)
+        return Outcome(task.puzzle, task.part, result, time.perf_counter() - start_time)
+    except TaskTimeout:
+        return Outcome(task.puzzle, task.part, None, time.perf_counter() - start_time, "TIMEOUT")
+    except Exception as e:
+        error = f"ERROR ({type(e).__name__})"
+        return Outcome(task.puzzle, task.part, None, time.perf_counter() - start_time, error)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def get_cache_key(puzzle: Puzzle, part: int) -> CacheKey:
+    input_hash = sha256(runner.get_input(puzzle, part, example=False))
+    return CacheKey(puzzle.year, puzzle.day, part, input_hash, get_source_hash(puzzle))
+
+
+def run_sweep(
+    puzzles: list[Puzzle],
+    jobs: int | None,
+    timeout: float | None,
+    cache: ResultCache | None = None,
+    refresh: bool = False,
+) -> list[Outcome]:
+    """
+    Run both parts of every puzzle, only recomputing those without a cached result
+    All cache reads and writes happen in this process, the workers never touch the database
+    """
+    outcomes: list[Outcome] = []
+    tasks: list[Task] = []
+    cache_keys: dict[tuple[Puzzle, int], CacheKey] = {}
+    for puzzle in puzzles:
+        for part in (1, 2):
+            if cache is not None:
+                key = cache_keys[puzzle, part] = get_cache_key(puzzle, part)
+                if not refresh and (hit := cache.get(key)) is not None:
+                    outcomes.append(Outcome(puzzle, part, hit[0], hit[1], cached=True))
+                    continue
+            tasks.append(Task(puzzle, part, runner.get_input_path(puzzle, part, False), timeout))
+
+    for outcome in run_tasks(tasks, jobs):
+        if cache is not None and outcome.error is None:
+            assert outcome.result is not None
+            cache_key = cache_keys[outcome.puzzle, outcome.part]
+            cache.put(cache_key, outcome.result, outcome.duration)
+        outcomes.append(outcome)
+    return sorted(outcomes)
+
+
+def run_tasks(tasks: list[Task], jobs: int | None) -> list[Outcome]:
+    """Run tasks across a process pool, returning outcomes in the same order as the tasks"""
+    if not tasks:
+        return []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(run_task, tasks))
+
+
+def format_table(outcomes: list[Outcome]) -> str:
+    by_puzzle: dict[Puzzle, dict[int, Outcome]] = {}
+    for outcome in outcomes:
+        by_puzzle.setdefault(outcome.puzzle, {})[outcome.part] = outcome
+
+    header = ("Puzzle", "Part 1", "Time", "Part 2", "Time")
+    rows: list[tuple[str, ...]] = [header]
+    for puzzle, parts in sorted(by_puzzle.items()):
+        row = [str(puzzle)]
+        for part in (1, 2):
+            outcome = parts[part]
+            time_str = "cached" if outcome.cached else f"{outcome.duration:.3f}s"
+            row.extend((outcome.result_str(), time_str))
+        rows.append(tuple(row))
+
+    widths = [max(len(row[col]) for row in rows) for col in range(len(header))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(line.rstrip() for line in lines)
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+import verify
+
+# Runtime checks are opt-in, since the baselines were recorded on one particular machine
+REGRESSION_RATIO = (
+    float(os.environ["AOC_REGRESSION_RATIO"]) if "AOC_REGRESSION_RATIO" in os.environ else None
+)
+
+
+@pytest.mark.parametrize("expectation", verify.load_manifest(), ids=str)
+def test_answer(expectation: verify.Expectation, record_property) -> None:
+    check = verify.check(expectation)
+    record_property("duration", check.outcome.duration)
+    record_property("baseline", expectation.baseline)
+    assert check.outcome.error is None, check.outcome.error
+    assert check.is_correct, f"Expected {expectation.answer!r}, got {check.outcome.result!r}"
+    assert not check.is_regression(REGRESSION_RATIO), (
+        f"Took {check.outcome.duration:.3f}s, "
+        f"more than {REGRESSION_RATIO}x the {expectation.baseline:.3f}s baseline"
+    )
@@ -0,0 +1,39 @@
+from grid import Grid
+
+
+class SlottedGrid(Grid):
+    __slots__ = ("label",)
+    label: str
+
+
+class AnnotatedGrid(Grid):
+    note: str  # Stored in __dict__, since this subclass doesn't declare __slots__
+
+
+def test_copy_keeps_attributes_and_owns_cells() -> None:
+    slotted = SlottedGrid.from_text("ab\ncd")
+    slotted.label = "slotted"
+    annotated = AnnotatedGrid.from_text("ab\ncd")
+    annotated.note = "annotated"
+
+    for grid, attr in ((slotted, "label"), (annotated, "note")):
+        copied = grid.copy()
+        assert type(copied) is type(grid)
+        assert copied.num_rows == 2 and copied.num_cols == 2
+        assert getattr(copied, attr) == getattr(grid, attr)
+
+        copied[copied.index(0, 0)] = ord("z")
+        assert str(copied) == "zb\ncd"
+        assert str(grid) == "ab\ncd"
+
+
+def test_offsets_and_coordinates() -> None:
+    grid = Grid.from_text("abc\ndef\nghi")
+    center = grid.index(1, 1)
+    assert [chr(grid[center + offset]) for offset in grid.orthogonal_offsets] == list("bfhd")
+    assert [chr(grid[center + offset]) for offset in grid.neighbor_offsets] == list("bcfihgda")
+
+    assert grid.row_col(center) == (1, 1)
+    assert all(grid.in_bounds(index) for index in grid.indices())
+    assert not grid.in_bounds(grid.index(0, 0) + grid.orthogonal_offsets[0])
+    assert not grid.in_bounds(grid.index(2, 2) + grid.orthogonal_offsets[1])
@@ -0,0 +1,21 @@
+import functools
+
+import parallel
+
+
+def test_map_in_chunks_splits_across_jobs() -> None:
+    chunk_sums = parallel.map_in_chunks(sum, range(100), min_items_per_job=10, jobs=3)
+    assert chunk_sums == [sum(range(idx, 100, 3)) for idx in range(3)]
+    assert parallel.map_in_chunks(sum, range(100), min_items_per_job=60, jobs=3) == [4950]
+
+
+def test_map_items_keeps_order() -> None:
+    items = list(range(-50, 50))
+    assert parallel.map_items(abs, items, min_items_per_job=1, jobs=4) == list(map(abs, items))
+    assert parallel.map_items(abs, [], min_items_per_job=1, jobs=4) == []
+
+
+def test_workers_never_start_nested_pools() -> None:
+    get_num_jobs = functools.partial(parallel.get_num_jobs, min_items_per_job=1, jobs=4)
+    assert get_num_jobs(100) == 4
+    assert parallel.map_items(get_num_jobs, [100, 100], min_items_per_job=1, jobs=2) == [1, 1]
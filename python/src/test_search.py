@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+import search
+
+Graph = dict[int, list[tuple[int, int]]]  # State to (neighbor, cost) pairs
+
+
+def make_graph(seed: int, min_cost: int, max_cost: int) -> Graph:
+    rng = random.Random(seed)
+    num_states = rng.randint(1, 12)
+    return {
+        state: [
+            (rng.randrange(num_states), rng.randint(min_cost, max_cost))
+            for _ in range(rng.randint(0, 4))
+        ]
+        for state in range(num_states)
+    }
+
+
+def brute_force_distances(graph: Graph, starts: list[int]) -> dict[int, int]:
+    """Bellman-Ford, relaxing every edge until nothing changes"""
+    distances = {start: 0 for start in starts}
+    changed = True
+    while changed:
+        changed = False
+        for state, edges in graph.items():
+            if state not in distances:
+                continue
+            for neighbor, cost in edges:
+                if distances[state] + cost < distances.get(neighbor, float("inf")):
+                    distances[neighbor] = distances[state] + cost
+                    changed = True
+    return distances
+
+
+def reverse_graph(graph: Graph) -> Graph:
+    reversed_graph: Graph = {state: [] for state in graph}
+    for state, edges in graph.items():
+        for neighbor, cost in edges:
+            reversed_graph[neighbor].append((state, cost))
+    return reversed_graph
+
+
+def check_result(
+    result: search.SearchResult | None, graph: Graph, starts: list[int], goals: set[int]
+) -> None:
+    distances = brute_force_distances(graph, starts)
+    reachable_goals = [goal for goal in goals if goal in distances]
+    if not reachable_goals:
+        assert result is None
+        return
+
+    assert result is not None
+    expected_cost = min(distances[goal] for goal in reachable_goals)
+    assert result.cost == expected_cost
+    assert all(goal in goals and distances[goal] == expected_cost for goal in result.goals)
+
+    path = result.path()
+    assert path[0] in starts and path[-1] == result.goals[0]
+    edge_costs = [
+        min(cost for neighbor, cost in graph[state] if neighbor == next_state)
+        for state, next_state in zip(path, path[1:])
+    ]
+    assert sum(edge_costs) == expected_cost
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_searches_match_brute_force(seed: int) -> None:
+    rng = random.Random(seed)
+    graph = make_graph(seed, 0, 9)
+    starts = rng.sample(sorted(graph), rng.randint(1, min(2, len(graph))))
+    goals = set(rng.sample(sorted(graph), rng.randint(1, min(3, len(graph)))))
+    result = search.dijkstra(starts, graph.__getitem__, goals.__contains__)
+    check_result(result, graph, starts, goals)
+
+    # The exact remaining cost is the strongest heuristic that A* allows
+    to_goals = brute_force_distances(reverse_graph(graph), list(goals))
+
+    def heuristic(state: int) -> int:
+        return to_goals.get(state, 0)
+
+    result = search.astar(starts, graph.__getitem__, goals.__contains__, heuristic)
+    check_result(result, graph, starts, goals)
+
+    graph = make_graph(seed, 0, 1)
+    result = search.zero_one_bfs(starts, graph.__getitem__, goals.__contains__)
+    check_result(result, graph, starts, goals)
+
+    # BFS is the same as Dijkstra where every step costs 1
+    graph = {state: [(neighbor, 1) for neighbor, _ in edges] for state, edges in graph.items()}
+    unweighted = {state: [neighbor for neighbor, _ in edges] for state, edges in graph.items()}
+    result = search.bfs(starts, unweighted.__getitem__, goals.__contains__)
+    check_result(result, graph, starts, goals)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_all_predecessors_finds_every_state_on_a_shortest_path(seed: int) -> None:
+    graph = make_graph(seed, 1, 3)
+    start, goal = 0, len(graph) - 1
+    result = search.dijkstra([start], graph.__getitem__, goal.__eq__, all_predecessors=True)
+    from_start = brute_force_distances(graph, [start])
+    if goal not in from_start:
+        assert result is None
+        return
+
+    # A state is on a shortest path if the best path through it costs the same as the best path
+    to_goal = brute_force_distances(reverse_graph(graph), [goal])
+    expected = {
+        state
+        for state in graph
+        if state in from_start
+        and state in to_goal
+        and from_start[state] + to_goal[state] == from_start[goal]
+    }
+    assert result is not None
+    assert result.states_on_shortest_paths() == expected
@@ -0,0 +1,112 @@
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+from runner import INPUTS_DIR, Puzzle
+from sweep import Outcome, Task, run_task, run_tasks
+
+MANIFEST_PATH = INPUTS_DIR / "answers.json"
+DEFAULT_REGRESSION_RATIO = 2.0
+# Runtimes below this many seconds are too noisy to meaningfully compare against a baseline
+MIN_REGRESSION_SECONDS = 0.1
+
+
+class Expectation(NamedTuple):
+    year: int
+    day: int
+    part: int
+    input: str  # Filename within inputs/yearYYYY/
+    answer: str | int
+    baseline: float | None = None  # Runtime in seconds when the answer was last recorded
+
+    @property
+    def puzzle(self) -> Puzzle:
+        return Puzzle(self.year, self.day)
+
+    @property
+    def input_path(self) -> Path:
+        return INPUTS_DIR / f"year{self.year:04d}" / self.input
+
+    def __str__(self) -> str:
+        return f"{self.year}-{self.day:02d}-p{self.part}-{self.input}"
+
+
+class Check(NamedTuple):
+    expectation: Expectation
+    outcome: Outcome
+
+    @property
+    def is_correct(self) -> bool:
+        if self.outcome.error is not None:
+            return False
+        return str(self.outcome.result).strip("\n") == str(self.expectation.answer).strip("\n")
+
+    def is_regression(self, ratio: float | None) -> bool:
+        """Baselines are wall-clock times from one machine, so this is only checked on request"""
+        baseline = self.expectation.baseline
+        if ratio is None or baseline is None or self.outcome.duration < MIN_REGRESSION_SECONDS:
+            return False
+        return self.outcome.duration > ratio * baseline
+
+    def status(self, ratio: float | None) -> str:
+        if self.outcome.error is not None:
+            return self.outcome.error
+        elif not self.is_correct:
+            return f"WRONG (got {self.outcome.result!r})"
+        elif self.is_regression(ratio):
+            return "SLOW"
+        return "ok"
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> list[Expectation]:
+    return [Expectation(**entry) for entry in json.loads(path.read_text())]
+
+
+def save_manifest(expectations: list[Expectation], path: Path = MANIFEST_PATH) -> None:
+    # One entry per line keeps diffs of the manifest readable
+    entries = [json.dumps(expectation._asdict()) for expectation in sorted(expectations)]
+    path.write_text("[\n  " + ",\n  ".join(entries) + "\n]\n")
+
+
+def to_task(expectation: Expectation, timeout: float | None) -> Task:
+    return Task(expectation.puzzle, expectation.part, expectation.input_path, timeout)
+
+
+def check(expectation: Expectation, timeout: float | None = None) -> Check:
+    """Run a single expectation in this process"""
+    return Check(expectation, run_task(to_task(expectation, timeout)))
+
+
+def run_checks(
+    expectations: list[Expectation], jobs: int | None, timeout: float | None
+) -> list[Check]:
+    outcomes = run_tasks([to_task(expectation, timeout) for expectation in expectations], jobs)
+    return [Check(expectation, outcome) for expectation, outcome in zip(expectations, outcomes)]
+
+
+def record_baselines(checks: list[Check], path: Path = MANIFEST_PATH) -> int:
+    """
+    Store measured runtimes of correct answers as the new baselines
+    Returns the number of baselines updated
+    """
+    new_baselines = {
+        check.expectation: round(check.outcome.duration, 4) for check in checks if check.is_correct
+    }
+    updated = [
+        expectation._replace(baseline=new_baselines.get(expectation, expectation.baseline))
+        for expectation in load_manifest(path)
+    ]
+    save_manifest(updated, path)
+    return len(new_baselines)
+
+
+def format_report(checks: list[Check], ratio: float | None) -> str:
+    lines: list[str] = []
+    for check in checks:
+        baseline = check.expectation.baseline
+        baseline_str = f" (baseline {baseline:.3f}s)" if baseline is not None else ""
+        lines.append(
+            f"{str(check.expectation):<28} {check.status(ratio):<12} "
+            f"{check.outcome.duration:.3f}s{baseline_str}"
+        )
+    return "\n".join(lines)
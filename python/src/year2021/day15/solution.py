@@ -1,40 +1,116 @@
-from functools import total_ordering
 from pathlib import Path
-from queue import PriorityQueue
-from typing import Any, Dict, List, NamedTuple, Optional, Set
+from typing import List, NamedTuple
 
 INPUT_PATH = Path(__file__).parent / "input.txt"
 TEST_INPUT_PATH = Path(__file__).parent / "test_input.txt"
 
-
-class Point(NamedTuple):
-    x: int
-    y: int
-
-    def neighbors(self) -> Set["Point"]:
-        return {
-            Point(self.x + 1, self.y),
-            Point(self.x - 1, self.y),
-            Point(self.x, self.y + 1),
-            Point(self.x, self.y - 1),
-        }
-
-
-@total_ordering
-class WeightedPath(NamedTuple):
-    points: List[Point]
-    weight: int  # Could be derived from path and graph, but nice to not recalculate every time
-
-    def add(self, point: Point, weight: int) -> "WeightedPath":
-        return WeightedPath(self.points[:] + [point], self.weight + weight)
-
-    def __lt__(self, other: Any) -> bool:
-        if not isinstance(other, WeightedPath):
-            raise ValueError(f"Cannot compare WeightedPath to {other=}")
-        return self.weight < other.weight
-
-
-Graph = Dict[Point, int]
+MAX_RISK = 9
+UNREACHED = 1 << 62
+BORDER = -1  # Distance for cells outside the grid, so they never look worth visiting
+
+
+class Graph(NamedTuple):
+    weights: List[int]  # Row-major, so point (x, y) is at index y * width + x
+    width: int
+    height: int
+    tiles: int = 1  # The weights are repeated tiles x tiles times, rising by 1 per tile
+
+    @property
+    def full_width(self) -> int:
+        return self.width * self.tiles
+
+    @property
+    def full_height(self) -> int:
+        return self.height * self.tiles
+
+
+class ShortestPaths:
+    """
+    Dijkstra from the top left of the (tiled) graph with Dial's bucket queue: since weights are
+    at most MAX_RISK, all queued costs are within MAX_RISK of the current one, so a ring of
+    MAX_RISK + 1 lists replaces the heap. Tiles are never materialized, weights are computed
+    from the base weights as needed. Distances live in a flat list with a border of BORDER
+    cells (padded row width = full width + 1, and the border is shared between rows).
+    """
+
+    def __init__(self, graph: Graph):
+        self.graph = graph
+        self.row_width = graph.full_width + 1
+        self.distances = [BORDER] * (self.row_width * (graph.full_height + 2))
+        for y in range(graph.full_height):
+            start = self.index(0, y)
+            self.distances[start : start + graph.full_width] = [UNREACHED] * graph.full_width
+
+        # For each row and column of the full graph: where it is in the base tile, and how
+        # much its tile adds to the weight
+        self._row_bases = [(y % graph.height) * graph.width for y in range(graph.full_height)]
+        self._row_increments = [y // graph.height for y in range(graph.full_height)]
+        self._col_bases = [x % graph.width for x in range(graph.full_width)]
+        self._col_increments = [x // graph.width for x in range(graph.full_width)]
+        # Risk after adding a tile's increment to a base risk, wrapping from 9 back around to 1
+        max_risk = MAX_RISK + 2 * (graph.tiles - 1)
+        self._wrapped_risks = [(risk - 1) % MAX_RISK + 1 for risk in range(max_risk + 1)]
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.row_width + x
+
+    def weight(self, index: int) -> int:
+        y, x = divmod(index, self.row_width)
+        y -= 1
+        base = self.graph.weights[self._row_bases[y] + self._col_bases[x]]
+        return self._wrapped_risks[base + self._row_increments[y] + self._col_increments[x]]
+
+    def find_cost(self, x: int, y: int) -> int:
+        """Lowest total risk to reach (x, y), finishing the search only as far as needed"""
+        distances, weight = self.distances, self.weight
+        goal = self.index(x, y)
+        offsets = (1, -1, self.row_width, -self.row_width)
+        buckets: List[List[int]] = [[] for _ in range(MAX_RISK + 1)]
+
+        distances[self.index(0, 0)] = 0
+        buckets[0].append(self.index(0, 0))
+        num_queued = 1
+        cost = 0
+        while num_queued:
+            bucket = buckets[cost % len(buckets)]
+            while bucket:
+                index = bucket.pop()
+                num_queued -= 1
+                if distances[index] != cost:
+                    continue  # Stale entry, the cell was reached more cheaply since
+                if index == goal:
+                    return cost
+                for offset in offsets:
+                    neighbor = index + offset
+                    if distances[neighbor] > cost:
+                        neighbor_cost = cost + weight(neighbor)
+                        if neighbor_cost < distances[neighbor]:
+                            distances[neighbor] = neighbor_cost
+                            buckets[neighbor_cost % len(buckets)].append(neighbor)
+                            num_queued += 1
+            cost += 1
+        raise RuntimeError("No path found")
+
+    def path(self, x: int, y: int) -> List[tuple[int, int]]:
+        """
+        A lowest risk path from the top left to (x, y), start first, rebuilt by walking back
+        through neighbors whose distance accounts exactly for the step's weight
+        Only valid after find_cost(x, y)
+        """
+        index = self.index(x, y)
+        start = self.index(0, 0)
+        offsets = (1, -1, self.row_width, -self.row_width)
+        path = [index]
+        while index != start:
+            previous_cost = self.distances[index] - self.weight(index)
+            index = next(
+                index + offset
+                for offset in offsets
+                if self.distances[index + offset] == previous_cost
+            )
+            path.append(index)
+        path.reverse()
+        return [(index % self.row_width, index // self.row_width - 1) for index in path]
 
 
 def read_input(use_test_input: bool = False) -> str:
@@ -42,107 +118,20 @@ def read_input(use_test_input: bool = False) -> str:
     return open(input_path).read().strip()
 
 
-def parse_input(use_test_input: bool = False) -> Graph:
-    point_weights = dict()
-    x = y = 0
-    for char in read_input(use_test_input):
-        if char == "\n":
-            y += 1
-            x = 0
-        else:
-            point_weights[Point(x, y)] = int(char)
-            x += 1
-    return point_weights
-
-
-def find_shortest_path(graph: Graph) -> Optional[WeightedPath]:
-    """Implementation of Dijkstra's algorithm"""
-    # Initialize things
-    start = Point(0, 0)
-    dest = max(graph.keys())
-    tentative_paths = {
-        point: WeightedPath([start], 0) if point == start else None for point in graph.keys()
-    }
-    unvisited_points = set(graph.keys())
-
-    path_queue: PriorityQueue = PriorityQueue()
-    path_queue.put(tentative_paths[start])
-
-    # Loop until we find the exit
-    current_point = start
-    while True:
-        if current_point == dest:
-            break
-
-        path_to_current_point = tentative_paths[current_point]
-        if path_to_current_point is None:
-            raise RuntimeError("Unexpected NoneType for path_to_current_point")
-        for neighbor in current_point.neighbors():
-            if neighbor in graph and neighbor in unvisited_points:
-                proposed_path_to_neighbor = path_to_current_point.add(
-                    point=neighbor, weight=graph[neighbor]
-                )
-                existing_path_to_neighbor = tentative_paths.get(neighbor)
-                if (
-                    not existing_path_to_neighbor
-                    or proposed_path_to_neighbor.weight < existing_path_to_neighbor.weight
-                ):
-                    tentative_paths[neighbor] = proposed_path_to_neighbor
-                    path_queue.put(proposed_path_to_neighbor)
-
-        # Mark as visited
-        unvisited_points.remove(current_point)
-
-        # Pick next unvisited point off the queue
-        next_path = path_queue.get()
-        current_point = next_path.points[-1]
-        while current_point not in unvisited_points:
-            next_path = path_queue.get()
-            current_point = next_path.points[-1]
-
-    return tentative_paths[dest]
+def parse_input(use_test_input: bool = False, tiles: int = 1) -> Graph:
+    lines = read_input(use_test_input).split("\n")
+    weights = [int(char) for line in lines for char in line]
+    return Graph(weights, len(lines[0]), len(lines), tiles)
+
+
+def find_min_risk(graph: Graph) -> int:
+    """Lowest total risk from the top left to the bottom right"""
+    return ShortestPaths(graph).find_cost(graph.full_width - 1, graph.full_height - 1)
 
 
 def part_1(use_test_input: bool = False) -> str:
-    graph = parse_input(use_test_input)
-    path = find_shortest_path(graph=graph)
-    if path:
-        print(path)
-        return f"{path.weight}"
-    else:
-        return "No path found"
-
-
-def extend_graph(graph: Graph) -> Graph:
-    # Use input graph as 5x5 tiling
-    output = dict()
-    bottom_right = max(graph.keys())
-    xdim, ydim = bottom_right.x + 1, bottom_right.y + 1
-    for xcount in range(5):
-        for ycount in range(5):
-            for original_point, original_weight in graph.items():
-                point = Point(original_point.x + xcount * xdim, original_point.y + ycount * ydim)
-                weight = ((original_weight + xcount + ycount) - 1) % 9 + 1
-                output[point] = weight
-    return output
-
-
-def print_graph(graph: Graph) -> None:
-    char_buffer = []
-    bottom_right = max(graph.keys())
-    for y in range(bottom_right.y + 1):
-        for x in range(bottom_right.x + 1):
-            char_buffer.append(str(graph[Point(x, y)]))
-        char_buffer.append("\n")
-    print("".join(char_buffer))
+    return f"{find_min_risk(parse_input(use_test_input))}"
 
 
 def part_2(use_test_input: bool = False) -> str:
-    graph = parse_input(use_test_input)
-    graph = extend_graph(graph)
-    path = find_shortest_path(graph=graph)
-    if path:
-        print(path)
-        return f"{path.weight}"
-    else:
-        return "No path found"
+    return f"{find_min_risk(parse_input(use_test_input, tiles=5))}"
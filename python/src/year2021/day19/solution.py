@@ -1,14 +1,25 @@
+import itertools
+from collections import Counter, defaultdict, deque
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 from numpy.linalg import matrix_power
 from numpy.typing import NDArray
 
+import parallel
+
 INPUT_PATH = Path(__file__).parent / "input.txt"
 TEST_INPUT_PATH = Path(__file__).parent / "test_input.txt"
 
+# Two scanners see at least 12 common beacons, which have 12 * 11 / 2 distances between them
+MIN_OVERLAP = 12
+MIN_SHARED_DISTANCES = MIN_OVERLAP * (MIN_OVERLAP - 1) // 2
+
+# Aligning a pair takes ~1ms, and real inputs have only a few dozen candidate pairs
+MIN_PAIRS_PER_JOB = 500
+
 
 ReadingSet = NDArray  # Nx3 2D array
 Rotation = NDArray  # 3x3 2D array
@@ -18,7 +29,7 @@ Vector = NDArray  # Length 3 1D array
 
 @lru_cache()
 def get_rotations() -> List[Rotation]:
-    eye = np.eye(3)
+    eye = np.eye(3, dtype=int)
     x_90 = np.array([[1, 0, 0], [0, 0, 1], [0, -1, 0]])
     y_90 = np.array([[0, 0, -1], [0, 1, 0], [1, 0, 0]])
     z_90 = np.array([[0, 1, 0], [-1, 0, 0], [0, 0, 1]])
@@ -38,104 +49,135 @@ def get_rotations() -> List[Rotation]:
     return rotations
 
 
-def rotate_reading_set(reading_set: ReadingSet, rotation: Rotation) -> ReadingSet:
-    return np.matmul(reading_set, rotation)
+def merge_reading_sets(reading_sets: Iterable[ReadingSet]) -> ReadingSet:
+    """Combine the input reading sets, deduplicated overlapping points"""
+    stacked = np.vstack(list(reading_sets))
+    return np.unique(stacked, axis=0)
 
 
-def translate_reading_set(reading_set: ReadingSet, translation: Translation) -> ReadingSet:
-    translation_matrix = np.repeat(translation, len(reading_set), axis=0)
-    return reading_set + translation_matrix
+class Transform(NamedTuple):
+    """Maps readings from one scanner's frame to another's: readings @ rotation + translation"""
 
+    rotation: Rotation
+    translation: Vector
 
-def count_overlap(first: ReadingSet, second: ReadingSet) -> int:
-    # Assumes no duplicates within each set
-    return len(first) + len(second) - len(merge_reading_sets([first, second]))
+    def apply(self, reading_set: ReadingSet) -> ReadingSet:
+        return reading_set @ self.rotation + self.translation
 
+    def then(self, other: "Transform") -> "Transform":
+        """The transform that applies this one followed by other"""
+        return Transform(self.rotation @ other.rotation, other.apply(self.translation))
 
-def merge_reading_sets(reading_sets: Iterable[ReadingSet]) -> ReadingSet:
-    """Combine the input reading sets, deduplicated overlapping points"""
-    stacked = np.vstack(list(reading_sets))
-    return np.unique(stacked, axis=0)
 
+class Fingerprint(NamedTuple):
+    """
+    Rotation and translation invariant description of a scanner's readings: for each beacon,
+    the set of squared distances to every other beacon it sees
+    """
 
-def align_reading_set(
-    this: ReadingSet, ref: ReadingSet
-) -> Optional[Tuple[ReadingSet, Rotation, Translation]]:
+    readings: ReadingSet
+    signatures: List[frozenset[int]]
+
+    @classmethod
+    def from_readings(cls, readings: ReadingSet) -> "Fingerprint":
+        deltas = readings[:, np.newaxis, :] - readings[np.newaxis, :, :]
+        distances = (deltas**2).sum(axis=2)
+        signatures = [
+            frozenset(row[:idx].tolist() + row[idx + 1 :].tolist())
+            for idx, row in enumerate(distances)
+        ]
+        return cls(readings, signatures)
+
+    def distances(self) -> set[int]:
+        return set().union(*self.signatures)
+
+
+def find_candidate_pairs(fingerprints: Dict[int, Fingerprint]) -> List[Tuple[int, int]]:
     """
-    Try rotation and translations of this reading set to see if we can get 12-point overlap
-      with the ref reading set.
-    If so, return a merged reading set with the entire ref set and the rotated + aligned
-      version of this set.
-    If not, return None.
-    If there are multiple ways to align, we pick one arbitrarily.
+    Pairs of scanners with enough squared distances in common that they might overlap
+    Uses an index from distance to scanners, so pairs with nothing in common cost nothing
     """
-    for rotation in get_rotations():
-        rotated_reading_set = rotate_reading_set(this, rotation)
-        result = align_reading_set_translate(rotated_reading_set, ref)
-        if result is not None:
-            aligned_reading_set, translation = result
-            return aligned_reading_set, rotation, translation
-    return None
+    scanners_by_distance: defaultdict[int, List[int]] = defaultdict(list)
+    for scanner, fingerprint in fingerprints.items():
+        for distance in fingerprint.distances():
+            scanners_by_distance[distance].append(scanner)
 
+    num_shared: Counter[Tuple[int, int]] = Counter()
+    for scanners in scanners_by_distance.values():
+        num_shared.update(itertools.combinations(scanners, 2))
+    return sorted(pair for pair, count in num_shared.items() if count >= MIN_SHARED_DISTANCES)
 
-def align_reading_set_translate(
-    this: ReadingSet, ref: ReadingSet
-) -> Optional[Tuple[ReadingSet, Translation]]:
+
+def align_pair(fingerprints: Tuple[Fingerprint, Fingerprint]) -> Optional[Transform]:
     """
-    Try just translations of this reading set to see if we can get 12-point overlap
-      with the ref reading set.
-    If so, return a copy of this reading set translated into the other reading set's frame
-    If not, return None
-    If there are multiple ways to align, we pick one arbitrarily
+    The transform from other's frame to ref's frame, if they share at least MIN_OVERLAP beacons
+    Beacons seen by both have the same distances to the other shared beacons, so matching
+    signatures pair up beacons, and the rotation is whichever one makes at least MIN_OVERLAP
+    pairs of matched beacons differ by the same translation (tolerating spurious matches)
     """
-    for this_row_idx in range(len(this)):
-        for ref_row_idx in range(len(ref)):
-            # Translate `this` so that the selected row in `this` matches the selected for in `ref`
-            translation = (
-                ref[ref_row_idx : ref_row_idx + 1, :] - this[this_row_idx : this_row_idx + 1, :]
-            )
-            translated_this = translate_reading_set(this, translation)
-
-            # If we find 12 overlapping points, we're done
-            num_overlap = count_overlap(translated_this, ref)
-            if num_overlap >= 12:
-                return translated_this, translation
+    ref, other = fingerprints
+    matches = [
+        (ref_idx, other_idx)
+        for ref_idx, ref_signature in enumerate(ref.signatures)
+        for other_idx, other_signature in enumerate(other.signatures)
+        if len(ref_signature & other_signature) >= MIN_OVERLAP - 1
+    ]
+    if len(matches) < MIN_OVERLAP:
+        return None
+
+    ref_points = ref.readings[[ref_idx for ref_idx, _ in matches]]
+    other_points = other.readings[[other_idx for _, other_idx in matches]]
+    for rotation in get_rotations():
+        translations = ref_points - other_points @ rotation
+        translation, count = Counter(map(tuple, translations.tolist())).most_common(1)[0]
+        if count >= MIN_OVERLAP:
+            return Transform(rotation, np.array(translation, dtype=translations.dtype))
     return None
 
 
+def align_pairs(
+    fingerprints: Dict[int, Fingerprint], pairs: List[Tuple[int, int]], jobs: Optional[int] = None
+) -> List[Optional[Transform]]:
+    fingerprint_pairs = [(fingerprints[ref], fingerprints[other]) for ref, other in pairs]
+    return parallel.map_items(align_pair, fingerprint_pairs, MIN_PAIRS_PER_JOB, jobs)
+
+
 def align_all_reading_sets(
     scanner_to_reading_set: Dict[int, ReadingSet], start_ref_scanner: int
 ) -> Dict[int, Vector]:
     """Updates scanner_to_reading_set input in place, and returns scanner locations"""
-    aligned_scanners = {start_ref_scanner}
-    align_to_queue = [start_ref_scanner]
-    scanner_locations = {start_ref_scanner: np.zeros((3,), dtype=int)}
-    while align_to_queue:
-        # Pick reference scanner from front of FIFO queue
-        ref_scanner = align_to_queue.pop(0)
-        ref_reading_set = scanner_to_reading_set[ref_scanner]
-
-        # Try to align each remaining unaligned scanner to it
-        unaligned_scanners = set(scanner_to_reading_set.keys()) - aligned_scanners
-        for unaligned_scanner in unaligned_scanners:
-            unaligned_reading_set = scanner_to_reading_set[unaligned_scanner]
-            result = align_reading_set(unaligned_reading_set, ref_reading_set)
-            if result is not None:
-                aligned_reading_set, rotation, translation = result
-                # Found an alignment! Add this scanner to the align_to_queue and update tracker vars
-                print(f"Found an alignment ({unaligned_scanner} to {ref_scanner})")
-                scanner_to_reading_set[unaligned_scanner] = aligned_reading_set
-                aligned_scanners.add(unaligned_scanner)
-                align_to_queue.append(unaligned_scanner)
-                scanner_locations[unaligned_scanner] = (
-                    np.matmul(np.zeros((3,), dtype=int), rotation) + translation
-                )
-
-    unaligned_scanners = set(scanner_to_reading_set.keys()) - aligned_scanners
+    fingerprints = {
+        scanner: Fingerprint.from_readings(reading_set)
+        for scanner, reading_set in scanner_to_reading_set.items()
+    }
+    pairs = find_candidate_pairs(fingerprints)
+
+    # Transforms between overlapping scanners, in both directions
+    neighbors: defaultdict[int, List[Tuple[int, Transform]]] = defaultdict(list)
+    for (first, second), transform in zip(pairs, align_pairs(fingerprints, pairs)):
+        if transform is not None:
+            neighbors[first].append((second, transform))
+            inverse_rotation = transform.rotation.T  # Rotations are orthogonal
+            inverse = Transform(inverse_rotation, -transform.translation @ inverse_rotation)
+            neighbors[second].append((first, inverse))
+
+    # Breadth first from the reference scanner, chaining transforms into its frame
+    to_ref = {start_ref_scanner: Transform(np.eye(3, dtype=int), np.zeros(3, dtype=int))}
+    queue = deque([start_ref_scanner])
+    while queue:
+        scanner = queue.popleft()
+        for neighbor, transform in neighbors[scanner]:
+            if neighbor not in to_ref:
+                to_ref[neighbor] = transform.then(to_ref[scanner])
+                queue.append(neighbor)
+
+    unaligned_scanners = set(scanner_to_reading_set.keys()) - set(to_ref)
     if unaligned_scanners:
         raise RuntimeError(f"Could not align scanners: {unaligned_scanners}")
 
-    return scanner_locations
+    for scanner, transform in to_ref.items():
+        scanner_to_reading_set[scanner] = transform.apply(scanner_to_reading_set[scanner])
+    return {scanner: transform.translation for scanner, transform in to_ref.items()}
 
 
 def read_input(use_test_input: bool = False) -> str:
@@ -185,14 +227,8 @@ def get_taxicab_dist(first: Vector, second: Vector) -> int:
 def part_2(use_test_input: bool = False) -> str:
     scanner_to_reading_set = parse_input(use_test_input)
     scanner_locations = align_all_reading_sets(scanner_to_reading_set, 0)
-    max_dist = 0
-    for first_scanner, first_vector in scanner_locations.items():
-        for second_scanner, second_vector in scanner_locations.items():
-            dist = get_taxicab_dist(first_vector, second_vector)
-            if dist > max_dist:
-                max_dist = dist
-                print(
-                    f"Found new max of {dist} "
-                    f"({first_scanner} at {first_vector} to {second_scanner} at {second_vector}"
-                )
+    max_dist = max(
+        get_taxicab_dist(first, second)
+        for first, second in itertools.combinations(scanner_locations.values(), 2)
+    )
     return f"{max_dist}"
@@ -0,0 +1,60 @@
+"""
+Compare volume engines for part 2 on the full puzzle input and on synthetic inputs
+Run from python/src with: python -m year2021.day22.benchmark
+"""
+import argparse
+import random
+
+import bench
+from year2021.day22.solution import ENGINES, INPUT_PATH, count_on, parse_step
+
+
+def make_synthetic_input(num_steps: int, seed: int, extent: int, max_side: int) -> str:
+    """Random steps (60% "on") with corners within +/- extent and sides up to max_side"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(num_steps):
+        state = "on" if rng.random() < 0.6 else "off"
+        specs = []
+        for axis in "xyz":
+            low = rng.randint(-extent, extent)
+            specs.append(f"{axis}={low}..{low + rng.randint(0, max_side)}")
+        lines.append(f"{state} {','.join(specs)}")
+    return "\n".join(lines)
+
+
+def bench_engines(label: str, puzzle_input: str, runs: int) -> None:
+    results = [
+        bench.bench_solution(
+            lambda text: count_on([parse_step(line) for line in text.split("\n")], engine),
+            puzzle_input,
+            f"{label}, {engine}",
+            runs,
+            0,
+        )
+        for engine in ENGINES
+    ]
+    assert len({result.result for result in results}) == 1, "Engines disagree"
+
+    baseline = results[0]
+    for result in results:
+        print(f"{result.to_str()} [{baseline.median_ns / result.median_ns:.1f}x]")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Benchmark 2021 Day 22 volume engines")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--steps", type=int, default=5000, help="Steps in each synthetic input")
+    parser.add_argument("--inputs", type=int, default=2, help="Number of synthetic inputs")
+    parser.add_argument("--extent", type=int, default=100000)
+    parser.add_argument("--max-side", dest="max_side", type=int, default=20000)
+    args = parser.parse_args()
+
+    bench_engines("Puzzle input", INPUT_PATH.read_text().strip(), args.runs)
+    for seed in range(args.inputs):
+        puzzle_input = make_synthetic_input(args.steps, seed, args.extent, args.max_side)
+        bench_engines(f"Synthetic {args.steps} steps (seed {seed})", puzzle_input, args.runs)
+
+
+if __name__ == "__main__":
+    main()
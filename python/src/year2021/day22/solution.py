@@ -1,5 +1,8 @@
+from collections import Counter
 from pathlib import Path
-from typing import List, NamedTuple, Optional, Set
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
 
 INPUT_PATH = Path(__file__).parent / "input.txt"
 TEST_INPUT_PATH = Path(__file__).parent / "test_input.txt"
@@ -21,14 +24,9 @@ class Interval(NamedTuple):
         high = min(self.high, other.high)
         return Interval(low, high) if low <= high else None
 
-    def get_offcuts(self, other: "Interval") -> Set["Interval"]:
-        """Cut away parts of this interval that don't overlap other"""
-        offcuts = set()
-        if self.low < other.low:
-            offcuts.add(Interval(self.low, min(self.high, other.low - 1)))
-        if self.high > other.high:
-            offcuts.add(Interval(max(self.low, other.high + 1), self.high))
-        return offcuts
+    def bounds(self) -> tuple[int, int]:
+        """Half-open bounds, so that adjacent intervals share a bound"""
+        return self.low, self.high + 1
 
     def __len__(self) -> int:
         return self.high - self.low + 1
@@ -46,48 +44,6 @@ class Box(NamedTuple):
         z_int = self.z_int.clamp(other.z_int)
         return Box(x_int, y_int, z_int) if x_int and y_int and z_int else None
 
-    def mask(self, _other: "Box") -> Set["Box"]:
-        """
-        Emit 1 or more boxes resulting from cutting out the other box
-        Strategy: cut off boxes from self until other is all that is left
-        """
-        other = _other.clamp(self)
-        if not other:
-            # No intersection
-            return {self}
-
-        # Otherwise, carve out pieces of self until just other is left
-        remaining = self
-        offcuts: Set[Box] = set()
-
-        # x off cuts
-        offcut_ints = remaining.x_int.get_offcuts(other.x_int)
-        offcuts.update(
-            Box(offcut_int, remaining.y_int, remaining.z_int) for offcut_int in offcut_ints
-        )
-        remaining = Box(other.x_int, remaining.y_int, remaining.z_int)
-
-        # y off cuts
-        offcut_ints = remaining.y_int.get_offcuts(other.y_int)
-        offcuts.update(
-            Box(remaining.x_int, offcut_int, remaining.z_int) for offcut_int in offcut_ints
-        )
-        remaining = Box(remaining.x_int, other.y_int, remaining.z_int)
-
-        # x off cuts
-        offcut_ints = remaining.z_int.get_offcuts(other.z_int)
-        offcuts.update(
-            Box(remaining.x_int, remaining.y_int, offcut_int) for offcut_int in offcut_ints
-        )
-        remaining = Box(remaining.x_int, remaining.y_int, other.z_int)
-
-        if remaining != other:
-            raise RuntimeError(
-                f"Offcuts did not leave us with other\nremaining={remaining}\nother={other}"
-            )
-
-        return offcuts
-
     def size(self) -> int:
         return len(self.x_int) * len(self.y_int) * len(self.z_int)
 
@@ -97,25 +53,79 @@ class RebootStep(NamedTuple):
     box: Box
 
 
-def get_on_boxes_after_step(on_boxes: Set[Box], step: RebootStep) -> Set[Box]:
-    # First mask the new box from all existing boxes
-    # Even if the new step is an "on" step, this will help get rid of overlap
-    next_on_boxes = set()
-    for on_box in on_boxes:
-        next_on_boxes.update(on_box.mask(step.box))
-
-    if step.state:
-        next_on_boxes.add(step.box)
-
-    return next_on_boxes
-
-
-def apply_steps(steps: List[RebootStep]) -> Set[Box]:
-    """Return the on-boxes"""
-    on_boxes: Set[Box] = set()
+def count_on_signed(steps: List[RebootStep]) -> int:
+    """
+    Inclusion-exclusion over signed cuboids: each cuboid counts +n or -n times toward the total
+    Every new step cancels out whatever the existing cuboids say about its box (by adding each
+    overlap with the opposite sign), and then "on" steps count their box once more
+    """
+    signed_boxes: Counter[Box] = Counter()
     for step in steps:
-        on_boxes = get_on_boxes_after_step(on_boxes, step)
-    return on_boxes
+        update: Counter[Box] = Counter()
+        for box, sign in signed_boxes.items():
+            if overlap := box.clamp(step.box):
+                update[overlap] -= sign
+        if step.state:
+            update[step.box] += 1
+
+        # Equal boxes are merged, and boxes that cancel out are dropped
+        for box, sign in update.items():
+            if signed_boxes[box] + sign:
+                signed_boxes[box] += sign
+            else:
+                del signed_boxes[box]
+    return sum(box.size() * sign for box, sign in signed_boxes.items())
+
+
+def count_on_compressed(steps: List[RebootStep]) -> int:
+    """
+    Sweep over slabs between consecutive distinct x bounds, where every cell in a slab has the
+    same history. Within each slab, the steps covering it are replayed in order on a boolean
+    grid whose rows and columns are the distinct y and z bounds of just those steps.
+    """
+    # bounds[step, axis] holds the half-open (low, high) bounds of each step's box
+    bounds = np.array([[interval.bounds() for interval in step.box] for step in steps])
+    states = [step.state for step in steps]
+    x_bounds = np.unique(bounds[:, 0])
+    first_slab = np.searchsorted(x_bounds, bounds[:, 0, 0])
+    end_slab = np.searchsorted(x_bounds, bounds[:, 0, 1])
+
+    is_active = np.zeros(len(steps), dtype=np.bool_)
+    num_on = 0
+    for slab, (x_low, x_high) in enumerate(zip(x_bounds, x_bounds[1:])):
+        is_active[first_slab == slab] = True
+        is_active[end_slab == slab] = False
+        if not is_active.any():
+            continue
+
+        active = np.flatnonzero(is_active)  # Step indices, so still in order
+        y_bounds = np.unique(bounds[active, 1])
+        z_bounds = np.unique(bounds[active, 2])
+        y_indices = np.searchsorted(y_bounds, bounds[active, 1]).tolist()
+        z_indices = np.searchsorted(z_bounds, bounds[active, 2]).tolist()
+        cells = np.zeros((len(y_bounds) - 1, len(z_bounds) - 1), dtype=np.bool_)
+        for step_idx, (y_low, y_high), (z_low, z_high) in zip(active, y_indices, z_indices):
+            cells[y_low:y_high, z_low:z_high] = states[step_idx]
+        area = np.diff(y_bounds) @ cells.astype(np.int64) @ np.diff(z_bounds)
+        num_on += int(x_high - x_low) * int(area)
+    return num_on
+
+
+ENGINES: Dict[str, Callable[[List[RebootStep]], int]] = {
+    "signed": count_on_signed,
+    "compressed": count_on_compressed,
+}
+
+
+def count_on(
+    steps: List[RebootStep], engine: str = "compressed", region: Optional[Box] = None
+) -> int:
+    """Number of cubes on after all the steps (only counting cubes within region, if given)"""
+    if region is not None:
+        steps = [
+            RebootStep(step.state, clamped) for step in steps if (clamped := step.box.clamp(region))
+        ]
+    return ENGINES[engine](steps)
 
 
 def read_input(use_test_input: bool = False) -> str:
@@ -141,17 +151,12 @@ def parse_input(use_test_input: bool = False) -> List[RebootStep]:
     return [parse_step(line) for line in raw_input.split("\n")]
 
 
-def part_1(use_test_input: bool = False) -> str:
+def part_1(use_test_input: bool = False, engine: str = "compressed") -> str:
     boundary_box = Box(Interval(-50, 50), Interval(-50, 50), Interval(-50, 50))
     steps = parse_input(use_test_input)
-    on_boxes = apply_steps(steps)
-    on_boxes = {clamped_box for on_box in on_boxes if (clamped_box := on_box.clamp(boundary_box))}
-    num_lights = sum(on_box.size() for on_box in on_boxes if on_box)
-    return f"{num_lights}"
+    return f"{count_on(steps, engine, boundary_box)}"
 
 
-def part_2(use_test_input: bool = False) -> str:
+def part_2(use_test_input: bool = False, engine: str = "compressed") -> str:
     steps = parse_input(use_test_input)
-    on_boxes = apply_steps(steps)
-    num_lights = sum(on_box.size() for on_box in on_boxes)
-    return f"{num_lights}"
+    return f"{count_on(steps, engine)}"
@@ -1,8 +1,7 @@
 from pathlib import Path
-from queue import PriorityQueue
-from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
-MAX_INT = 10**10
+import search
 
 Room = Tuple[str, ...]  # Length 4
 
@@ -59,163 +58,224 @@ def get_dest_state() -> State:
     return State(hallway, a_room, b_room, c_room, d_room)
 
 
-def get_pushed_room(_room: Room, home_char: str) -> Optional[Tuple[Room, int]]:
-    """Get the resulting room and dist of entering from the hallway (or None if impossible)"""
-    room = list(_room)
-    for i in range(3, -1, -1):
-        if not room[i]:  # Found the lowest open spot
-            room[i] = home_char
-            return tuple(room), i + 1
-        elif room[i] != home_char:  # This room cannot be entered
-            return None
-    return None  # Room is full of home char already
-
-
-def get_popped_room(_room: Room) -> Tuple[Room, str, int]:
-    """Pop top element out of room, return resulting room, popped char, and dist of exit"""
-    room = list(_room)
-    for i in range(4):
-        if room[i]:  # Found the spot to pop
-            popped_char = room[i]
-            room[i] = ""
-            return tuple(room), popped_char, i + 1
-    raise RuntimeError("Could not get popped room")
-
-
-def dist_to_reach_room(state: State, room_char: str, from_idx: int) -> Optional[int]:
-    room_loc = ROOM_LOCS[room_char]
-    is_passable = not any(
-        state.hallway[i] for i in range(min(room_loc, from_idx) + 1, max(room_loc, from_idx))
-    )
-    return abs(room_loc - from_idx) if is_passable else None
+# Search states pack the 27 slots (hallway left to right, then rooms A-D top to bottom) into
+# 3 bits each, where 0 is empty and 1-4 are entities A-D
+SLOT_CHARS = ("", "A", "B", "C", "D")
+SLOT_VALUES = {char: value for value, char in enumerate(SLOT_CHARS)}
+SLOT_BITS = 3
+SLOT_MASK = 0b111
+HALLWAY_SIZE = 11
+ROOM_SIZE = 4
+NUM_SLOTS = HALLWAY_SIZE + 4 * ROOM_SIZE
+PACKED_COSTS = (0, 1, 10, 100, 1000)  # Indexed by slot value
+PACKED_ROOM_LOCS = (0, 2, 4, 6, 8)  # Indexed by slot value
+HALLWAY_STOPS = tuple(idx for idx in range(HALLWAY_SIZE) if idx not in ROOM_LOCS.values())
 
 
-def enter_neighbors(state: State) -> Dict[State, int]:
-    """All valid moves where a entity is entering a room"""
-    output = dict()
-    for hall_idx, char in enumerate(state.hallway):
-        # Check if there is an entity here
-        if not char:
-            continue
-        # Check if the entity can reach its room
-        hallway_dist = dist_to_reach_room(state, char, hall_idx)
-        if hallway_dist is None:
-            continue
+def encode_state(state: State) -> int:
+    packed = 0
+    for char in reversed(state.hallway + state.a_room + state.b_room + state.c_room + state.d_room):
+        packed = (packed << SLOT_BITS) | SLOT_VALUES[char]
+    return packed
 
-        # Check if room can be entered
-        result = get_pushed_room(state.get_room_for_char(char), char)
-        if not result:
-            continue
-        new_room, entry_dist = result
-
-        # We found a neighbor state, compute it and the move cost
-        cost = (hallway_dist + entry_dist) * CHAR_COST[char]
-        new_hallway = list(state.hallway)
-        new_hallway[hall_idx] = ""
-        new_state_dict = {
-            **state._asdict(),
-            "hallway": tuple(new_hallway),
-            f"{char.lower()}_room": new_room,
-        }
-        output[State(**new_state_dict)] = cost
-    return output
-
-
-def get_available_hallway_locs(hallway: Tuple[str, ...], start_idx: int) -> Set[int]:
-    locs = set()
-
-    # Look right
-    dest_idx = start_idx + 1
-    while dest_idx < len(hallway) and not hallway[dest_idx]:
-        if dest_idx in ROOM_LOCS.values():  # Can't stop here
-            dest_idx += 1
-            continue
-        locs.add(dest_idx)
-        dest_idx += 1
-
-    # Look left
-    dest_idx = start_idx - 1
-    while dest_idx >= 0 and not hallway[dest_idx]:
-        if dest_idx in ROOM_LOCS.values():  # Can't stop here
-            dest_idx -= 1
-            continue
-        locs.add(dest_idx)
-        dest_idx -= 1
-    return locs
+
+def decode_state(packed: int) -> State:
+    slots = [SLOT_CHARS[get_slot(packed, i)] for i in range(NUM_SLOTS)]
+    rooms = [tuple(slots[i : i + ROOM_SIZE]) for i in range(HALLWAY_SIZE, NUM_SLOTS, ROOM_SIZE)]
+    return State(tuple(slots[:HALLWAY_SIZE]), *rooms)
+
+
+def get_slot(packed: int, slot: int) -> int:
+    return (packed >> (SLOT_BITS * slot)) & SLOT_MASK
+
+
+def room_slot(value: int, depth: int) -> int:
+    """Slot index of the given depth (0 is the top) in the room for the entity with this value"""
+    return HALLWAY_SIZE + (value - 1) * ROOM_SIZE + depth
+
+
+def get_hallway_mask(start_idx: int, end_idx: int) -> int:
+    """Mask of the hallway slots after start_idx, up to and including end_idx"""
+    step = 1 if end_idx > start_idx else -1
+    mask = 0
+    for idx in range(start_idx + step, end_idx + step, step):
+        mask |= SLOT_MASK << (SLOT_BITS * idx)
+    return mask
+
+
+# HALLWAY_MASKS[start_idx][end_idx] is all slots passed through walking from start_idx to end_idx
+HALLWAY_MASKS = tuple(
+    tuple(get_hallway_mask(start_idx, end_idx) for end_idx in range(HALLWAY_SIZE))
+    for start_idx in range(HALLWAY_SIZE)
+)
+
+HALLWAY_SHIFTS = tuple(SLOT_BITS * idx for idx in range(HALLWAY_SIZE))
+HALLWAY_ALL_MASK = (1 << (SLOT_BITS * HALLWAY_SIZE)) - 1
+ROOM_ALL_MASK = (1 << (SLOT_BITS * ROOM_SIZE)) - 1
+# ROOM_SHIFTS[value] is the shift of the room for the entity with this value, within a state
+ROOM_SHIFTS = (0, *(SLOT_BITS * room_slot(value, 0) for value in range(1, 5)))
+
+
+def get_entry_depth(room_value: int, room: int) -> int:
+    """Depth an entity would enter the room at, or -1 if the room holds other entities"""
+    occupants = [get_slot(room, depth) for depth in range(ROOM_SIZE)]
+    if any(occupant and occupant != room_value for occupant in occupants):
+        return -1
+    return occupants.count(0) - 1  # Move to the lowest open spot
+
+
+# ENTRY_DEPTHS[room value][packed room contents], so entering never loops over room slots
+ENTRY_DEPTHS = tuple(
+    tuple(get_entry_depth(room_value, room) for room in range(ROOM_ALL_MASK + 1))
+    for room_value in range(5)
+)
+
+
+def get_slot_remaining_cost(slot: int, value: int) -> int:
+    """
+    Lower bound on the cost for the entity with this value in this slot to reach its room
+    Counts the moves a misplaced entity needs to get into the top of its room
+    """
+    if not value:
+        return 0
+    elif slot < HALLWAY_SIZE:
+        return (abs(PACKED_ROOM_LOCS[value] - slot) + 1) * PACKED_COSTS[value]
+    room_value, depth = divmod(slot - HALLWAY_SIZE, ROOM_SIZE)
+    room_value += 1
+    if value == room_value:
+        return 0
+    dist = depth + 1 + abs(PACKED_ROOM_LOCS[value] - PACKED_ROOM_LOCS[room_value]) + 1
+    return dist * PACKED_COSTS[value]
+
+
+# SLOT_REMAINING_COSTS[slot][value] is each slot's contribution to the A* heuristic
+SLOT_REMAINING_COSTS = tuple(
+    tuple(get_slot_remaining_cost(slot, value) for value in range(5)) for slot in range(NUM_SLOTS)
+)
+
+
+def get_min_remaining_cost(packed: int) -> int:
+    """Lower bound on the cost to reach the destination, for A*"""
+    return sum(SLOT_REMAINING_COSTS[slot][get_slot(packed, slot)] for slot in range(NUM_SLOTS))
+
+
+Move = tuple[int, int, int]  # Neighbor state, the move cost, and the change in the heuristic
+# Hallway moves out of a room: where the entity lands, the value placed there, cost and heuristic
+# change. Room entrances are never stopped at, so only the stops themselves can block a walk.
+ExitStep = tuple[int, int, int, int]
+
+
+def get_exit_paths(room_value: int, room: int) -> tuple[int, tuple[tuple[ExitStep, ...], ...]]:
+    """
+    Mask clearing the entity that should leave the room next, and the stops it can walk to
+    (walking left, then walking right, nearest first), if the room isn't stable
+    """
+    occupants = [get_slot(room, depth) for depth in range(ROOM_SIZE)]
+    if all(not occupant or occupant == room_value for occupant in occupants):
+        return 0, ()  # This room is stable, don't empty it
+    elif not room_value or max(occupants) >= len(SLOT_CHARS):
+        return 0, ()  # Not a room, or not a valid packing of one
+
+    depth = occupants.count(0)  # The top occupant
+    value = occupants[depth]
+    source_slot = room_slot(room_value, depth)
+    room_loc = PACKED_ROOM_LOCS[room_value]
+    paths = (
+        [idx for idx in reversed(HALLWAY_STOPS) if idx < room_loc],
+        [idx for idx in HALLWAY_STOPS if idx > room_loc],
+    )
+    return ~(SLOT_MASK << (SLOT_BITS * source_slot)), tuple(
+        tuple(
+            (
+                SLOT_BITS * dest_idx,
+                value << (SLOT_BITS * dest_idx),
+                (depth + 1 + abs(dest_idx - room_loc)) * PACKED_COSTS[value],
+                SLOT_REMAINING_COSTS[dest_idx][value] - SLOT_REMAINING_COSTS[source_slot][value],
+            )
+            for dest_idx in path
+        )
+        for path in paths
+    )
 
 
-def exit_neighbors(state: State) -> Dict[State, int]:
-    """All valid moves where a entity is exiting a room"""
-    output = dict()
-    for room_char in "ABCD":
-        room_attr = f"{room_char.lower()}_room"
-        room = getattr(state, room_attr)
-        if all(not char or char == room_char for char in room):
-            continue  # This room is stable, don't empty it
-        new_room, popped_char, room_dist = get_popped_room(room)
+# EXIT_PATHS[room value][packed room contents], so exiting never loops over room slots
+EXIT_PATHS = tuple(
+    tuple(get_exit_paths(room_value, room) for room in range(ROOM_ALL_MASK + 1))
+    for room_value in range(5)
+)
 
-        start_idx = ROOM_LOCS[room_char]
-        available_hallway_locs = get_available_hallway_locs(state.hallway, start_idx)
 
-        for dest_idx in available_hallway_locs:
-            # Calculate state and cost of moving
-            hallway_dist = abs(dest_idx - start_idx)
-            cost = (room_dist + hallway_dist) * CHAR_COST[popped_char]
+def get_entry(packed: int) -> Move | None:
+    """A valid move where an entity enters its room, if there is one"""
+    if not packed & HALLWAY_ALL_MASK:
+        return None
+    for hall_idx in HALLWAY_STOPS:
+        shift = HALLWAY_SHIFTS[hall_idx]
+        if not (value := (packed >> shift) & SLOT_MASK):
+            continue
+
+        # Check if the entity can reach its room
+        room_loc = PACKED_ROOM_LOCS[value]
+        if packed & HALLWAY_MASKS[hall_idx][room_loc]:
+            continue
 
-            new_hallway = list(state.hallway)
-            new_hallway[dest_idx] = popped_char
-            new_state_dict = {**state._asdict(), "hallway": tuple(new_hallway), room_attr: new_room}
-            output[State(**new_state_dict)] = cost
+        # Check if room can be entered i.e. it only contains entities that belong there
+        room_shift = ROOM_SHIFTS[value]
+        depth = ENTRY_DEPTHS[value][(packed >> room_shift) & ROOM_ALL_MASK]
+        if depth < 0:
+            continue
 
-    return output
+        cost = (abs(room_loc - hall_idx) + depth + 1) * PACKED_COSTS[value]
+        neighbor = packed & ~(SLOT_MASK << shift) | (value << (room_shift + SLOT_BITS * depth))
+        return neighbor, cost, -SLOT_REMAINING_COSTS[hall_idx][value]
+    return None
 
 
-def get_neighbors(state: State) -> Dict[State, int]:  # Neighbor states and the cost of the move
-    return {**exit_neighbors(state), **enter_neighbors(state)}
+def get_exits(packed: int) -> list[Move]:
+    """All valid moves where an entity exits a room"""
+    moves = []
+    for room_value in range(1, 5):
+        room_shift = ROOM_SHIFTS[room_value]
+        clear_mask, paths = EXIT_PATHS[room_value][(packed >> room_shift) & ROOM_ALL_MASK]
+        emptied = packed & clear_mask
+        for path in paths:
+            for dest_shift, placed, cost, remaining_change in path:
+                if packed >> dest_shift & SLOT_MASK:
+                    break
+                moves.append((emptied | placed, cost, remaining_change))
+    return moves
 
 
 def find_min_cost(start: State) -> Optional[int]:
-    """Implementation of Dijkstra's algorithm"""
-    # Initialize things
-    dest = get_dest_state()
-    min_cost_per_state: Dict[State, int] = {start: 0}
-    visited_states: Set[State] = set()
-
-    queue: PriorityQueue = PriorityQueue()
-    queue.put((min_cost_per_state[start], start))
-
-    # Loop until we find the terminal state
-    current_cost, current_state = queue.get()
-    while True:
-        # Print progress
-        if len(visited_states) % 1000 == 0:
-            print(f"Visited {len(visited_states)} states.  Cost min = {current_cost}")
-
-        if current_state == dest:
-            break
-
-        for neighbor_state, move_cost in get_neighbors(current_state).items():
-            if neighbor_state in visited_states:
-                continue
-
-            known_neighbor_cost = min_cost_per_state.get(neighbor_state, MAX_INT)
-            proposed_neighbor_cost = current_cost + move_cost
-            if proposed_neighbor_cost < known_neighbor_cost:
-                min_cost_per_state[neighbor_state] = proposed_neighbor_cost
-                queue.put((min_cost_per_state[neighbor_state], neighbor_state))
-
-        # Mark as visited
-        visited_states.add(current_state)
-
-        # Pick next unvisited point off the queue
-        while current_state in visited_states:
-            # If queue is empty, we are stuck
-            if queue.empty():
-                print(f"Got stuck with empty queue with {len(visited_states)} visited states")
-                return -1
-            current_cost, current_state = queue.get()
-
-    return min_cost_per_state.get(dest)
+    """
+    A* search over packed states
+    Each move only changes two slots, so the heuristic of a neighbor is updated from the
+    heuristic of the state it was reached from rather than recomputed over every slot.
+
+    An entity that can enter its room never has to move again, and the total cost of filling a
+    room doesn't depend on the order, so whenever an entity can enter its room that is the only
+    move considered.
+    """
+    dest = encode_state(get_dest_state())
+    packed_start = encode_state(start)
+    min_remaining_costs = {packed_start: get_min_remaining_cost(packed_start)}
+
+    def get_neighbors(packed: int) -> list[tuple[int, int]]:  # Neighbor states and the move cost
+        min_remaining_cost = min_remaining_costs[packed]
+        entry = get_entry(packed)
+        neighbors = []
+        for neighbor, cost, remaining_change in [entry] if entry else get_exits(packed):
+            min_remaining_costs[neighbor] = min_remaining_cost + remaining_change
+            neighbors.append((neighbor, cost))
+        return neighbors
+
+    result = search.astar(
+        [packed_start],
+        get_neighbors,
+        lambda packed: packed == dest,
+        min_remaining_costs.__getitem__,
+    )
+    return None if result is None else result.cost
 
 
 def part_1(use_test_input: bool = False) -> str:
@@ -1,5 +1,10 @@
 import argparse
 import importlib
+import sys
+from pathlib import Path
+
+# Make modules shared across years (e.g. search) importable when run from this directory
+sys.path.append(str(Path(__file__).parent.parent))
 
 
 def main(day_num: int, part_num: int, is_test: bool) -> None:
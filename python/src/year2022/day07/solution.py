@@ -1,133 +1,94 @@
-import re
+import bisect
+import itertools
+from collections.abc import Iterable
 from typing import Optional
 
+TOTAL_SPACE = 70_000_000
+NEEDED_SPACE = 30_000_000
 
-class Command:
-    @staticmethod
-    def parse(text: str) -> "Command":
-        if text.startswith("cd"):
-            return Cd.parse(text)
-        elif text.startswith("ls"):
-            return Ls.parse(text)
-        else:
-            raise ValueError(f"Could not parse: {text}")
 
+class Directory:
+    """
+    size is the total size of every file under the directory, kept up to date as files are
+    found rather than computed afterwards. File names aren't stored at all: a directory's
+    files are only counted the first time it is listed.
+    """
 
-class Cd(Command):
-    def __init__(self, arg):
-        self.arg = arg
-
-    def __repr__(self):
-        return f"Cd(arg={self.arg})"
-
-    @staticmethod
-    def parse(text: str) -> "Cd":
-        match = re.match("cd (.*)", text.strip())
-        if not match:
-            raise ValueError(f"Could not parse: {text}")
-
-        return Cd(match.groups()[0])
-
-
-class Ls(Command):
-    def __init__(self, files: dict[str, int], directories: set[str]):
-        self.files = files
-        self.directories = directories
-
-    def __repr__(self):
-        return f"Cd(files={self.files}, directories={self.directories})"
-
-    @staticmethod
-    def parse(text: str) -> "Ls":
-        lines = text.strip().split("\n")
-        if not lines or lines[0] != "ls":
-            raise ValueError(f"Could not parse: {text}")
-
-        files = {}
-        directories = set()
-        for line in lines[1:]:
-            match = re.match(r"dir (.*)", line)
-            if match:
-                directories.add(match.groups()[0])
-                continue
-            match = re.match(r"(\d+) (.*)", line)
-            if match:
-                filesize, filename = match.groups()
-                files[filename] = int(filesize)
-                continue
-
-            raise ValueError(f"Could not parse {line=}")
-
-        return Ls(files, directories)
-
-
-def parse_input(text: str) -> list[Command]:
-    return [Command.parse(command) for command in text.lstrip("$ ").split("$ ")]
-
+    __slots__ = ("parent", "directories", "size", "is_listed")
 
-class Directory:
     def __init__(self, parent: Optional["Directory"] = None):
         self.parent = parent
-        self.files: dict[str, int] = {}
         self.directories: dict[str, Directory] = {}
+        self.size = 0
+        self.is_listed = False
 
-    def add(self, ls: Ls) -> None:
-        self.files.update(ls.files)
-        for directory_name in ls.directories:
-            if directory_name not in self.directories:
-                self.directories[directory_name] = Directory(parent=self)
-
-    def recursive_get_size(self) -> dict[tuple, int]:
-        result = {}
-
-        total_size = 0
-        for directory_name, directory in self.directories.items():
-            for sub_path, size in directory.recursive_get_size().items():
-                if not sub_path:
-                    # This is the immediate subdirectory
-                    total_size += size
-                result[(directory_name, *sub_path)] = size
-
-        for filesize in self.files.values():
-            total_size += filesize
-
-        result[tuple()] = total_size
-        return result
-
-    def __repr__(self) -> str:
-        return f"Directory(files={self.files}, directories={self.directories})"
+    def add_file(self, size: int) -> None:
+        directory: Optional[Directory] = self
+        while directory is not None:
+            directory.size += size
+            directory = directory.parent
 
 
-def build_filesystem(commands: list[Command]) -> Directory:
-    """Build a filesystem based on the commands and return the root directory"""
+def build_filesystem(lines: Iterable[str]) -> list[Directory]:
+    """
+    Builds the filesystem in a single pass over the transcript (e.g. an open file), returning
+    every directory with the root first
+    """
     root = cwd = Directory()
-    for command in commands:
-        if isinstance(command, Cd):
-            if command.arg == "/":
+    directories = [root]
+    is_relisting = False  # Whether we're reading output of ls for an already listed directory
+    for line in lines:
+        line = line.rstrip("\n")
+        # Names may contain spaces, so only split off as many tokens as each kind of line has
+        tokens = line.split(" ", 2) if line.startswith("$") else line.split(" ", 1)
+        match tokens:
+            case ["$", "cd", "/"]:
                 cwd = root
-            elif command.arg == "..":
+            case ["$", "cd", ".."]:
                 if cwd.parent is None:
                     raise RuntimeError("Cannot navigate to parent of the root directory")
                 cwd = cwd.parent
-            else:
-                cwd = cwd.directories[command.arg]
-            pass
-        elif isinstance(command, Ls):
-            cwd.add(command)
-        else:
-            raise ValueError(f"Unrecognized command: {command}")
-    return root
+            case ["$", "cd", name]:
+                cwd = cwd.directories[name]
+            case ["$", "ls"]:
+                is_relisting = cwd.is_listed
+                cwd.is_listed = True
+            case ["dir", name] if not is_relisting:
+                cwd.directories[name] = directory = Directory(parent=cwd)
+                directories.append(directory)
+            case [size, _] if not is_relisting:
+                cwd.add_file(int(size))
+            case [_, _] if is_relisting:
+                pass
+            case _:
+                raise ValueError(f"Could not parse {line=}")
+    return directories
+
+
+class SizeIndex:
+    """Directory sizes in sorted order, for answering queries with binary search"""
+
+    def __init__(self, directories: list[Directory]):
+        self.sizes = sorted(directory.size for directory in directories)
+        self.cumulative_sizes = list(itertools.accumulate(self.sizes, initial=0))
+
+    def total_at_most(self, limit: int) -> int:
+        """Sum of the sizes of every directory no bigger than limit"""
+        return self.cumulative_sizes[bisect.bisect_right(self.sizes, limit)]
+
+    def smallest_at_least(self, minimum: int) -> int:
+        index = bisect.bisect_left(self.sizes, minimum)
+        if index == len(self.sizes):
+            raise ValueError(f"No directory has size at least {minimum}")
+        return self.sizes[index]
 
 
 def part_1(puzzle_input: str) -> str | int:
-    commands = parse_input(puzzle_input)
-    root = build_filesystem(commands)
-    return sum(size for size in root.recursive_get_size().values() if size <= 10**5)
+    directories = build_filesystem(puzzle_input.split("\n"))
+    return SizeIndex(directories).total_at_most(10**5)
 
 
 def part_2(puzzle_input: str) -> str | int:
-    commands = parse_input(puzzle_input)
-    root = build_filesystem(commands)
-    sizes = root.recursive_get_size()
-    space_to_free = sizes[tuple()] - 40_000_000
-    return min(size for size in sizes.values() if size >= space_to_free)
+    root, *subdirectories = build_filesystem(puzzle_input.split("\n"))
+    space_to_free = root.size - (TOTAL_SPACE - NEEDED_SPACE)
+    return SizeIndex([root, *subdirectories]).smallest_at_least(space_to_free)
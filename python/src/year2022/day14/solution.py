@@ -1,6 +1,8 @@
-from enum import Enum
+from collections.abc import Iterator
 from typing import NamedTuple
 
+from grid import Grid
+
 
 class Location(NamedTuple):
     row: int
@@ -15,74 +17,80 @@ def parse_locations(text: str) -> list[Location]:
     return locations
 
 
-class Object(Enum):
-    SAND = "o"
-    WALL = "#"
+EMPTY = ord(".")
+WALL = ord("#")
+SAND = ord("o")
+ABYSS = ord(" ")  # Grid border, sand that reaches it falls forever
+SOURCE = Location(0, 500)
 
 
 class Cave:
+    """
+    Dense grid from the sand source down to the floor, wide enough for the pile of sand that
+    can form on the floor (which spreads at most one column per row) and for every wall
+    """
+
     def __init__(self, puzzle_input: str, *, is_solid_floor: bool):
-        self._start = Location(0, 500)
-        self._contents: dict[Location, Object] = {}
-        for line in puzzle_input.split("\n"):
-            locations = parse_locations(line)
-            for i in range(len(locations) - 1):
-                self._add_wall(locations[i], locations[i + 1])
-
-        # We use an infinite floor either way, and conditionally choose whether
-        # Sand can actually rest there depending on self._is_solid_flor
-        self._floor_row = max(loc.row for loc in self._contents) + 2
-        self._is_solid_floor = is_solid_floor
+        walls = [parse_locations(line) for line in puzzle_input.split("\n")]
+        floor_row = max(loc.row for path in walls for loc in path) + 2
+        min_col = min(SOURCE.col - floor_row, *(loc.col for path in walls for loc in path))
+        max_col = max(SOURCE.col + floor_row, *(loc.col for path in walls for loc in path))
+        self._min_col = min_col
+
+        # Without a solid floor, the floor row is left off so sand falls into the border
+        num_rows = floor_row + 1 if is_solid_floor else floor_row
+        self.grid = Grid(num_rows, max_col - min_col + 1, border=chr(ABYSS))
+        for path in walls:
+            for start, end in zip(path, path[1:]):
+                self._add_wall(start, end)
+        if is_solid_floor:
+            self._add_wall(Location(floor_row, min_col), Location(floor_row, max_col))
+
+    def _index(self, location: Location) -> int:
+        return self.grid.index(location.row, location.col - self._min_col)
 
     def _add_wall(self, start: Location, end: Location) -> None:
         if start.row == end.row:
             for col in range(min(start.col, end.col), max(start.col, end.col) + 1):
-                self._contents[Location(start.row, col)] = Object.WALL
+                self.grid[self._index(Location(start.row, col))] = WALL
         elif start.col == end.col:
             for row in range(min(start.row, end.row), max(start.row, end.row) + 1):
-                self._contents[Location(row, start.col)] = Object.WALL
+                self.grid[self._index(Location(row, start.col))] = WALL
         else:
             raise ValueError(f"Cannot build diagonal wall from {start} to {end}")
 
-    def drop_sand(self) -> bool:
-        """Place a new piece of sand if possible (return whether it was possible)"""
-        # Cannot even start movement if the start location is occupied
-        if self._start in self._contents:
-            return False
-
-        # Apply movement rules until we cannot move anymore
-        pos = self._start
-        while True:
-            next_pos = pos
-            for col_offset in (0, -1, 1):
-                neighbor = Location(pos.row + 1, pos.col + col_offset)
-                if neighbor not in self._contents and neighbor.row != self._floor_row:
-                    next_pos = neighbor
+    def pour(self) -> Iterator[int]:
+        """
+        Drops sand one grain at a time, lazily yielding the index where each grain comes to rest,
+        until the source is blocked or sand falls into the abyss
+        A grain falls along the previous grain's path up to where that one came to rest, so we
+        keep that path as a stack and resume from its top instead of starting at the source
+        """
+        cells = self.grid.cells
+        down = self.grid.width
+        moves = (down, down - 1, down + 1)
+        path = [self._index(SOURCE)]
+        while path:
+            position = path[-1]
+            for move in moves:
+                next_cell = cells[position + move]
+                if next_cell == EMPTY:
+                    path.append(position + move)
                     break
-
-            if next_pos == pos:
-                # No more movement, break
-                break
+                elif next_cell == ABYSS:
+                    return
             else:
-                pos = next_pos
-
-        if not self._is_solid_floor and pos.row + 1 == self._floor_row:
-            # Cannot place sand because floor is not solid, it should fall through
-            return False
-        else:
-            self._contents[pos] = Object.SAND
-            return True
+                cells[position] = SAND
+                path.pop()
+                yield position
 
-    def fill(self) -> int:
-        num_sand = 0
-        while self.drop_sand():
-            num_sand += 1
-        return num_sand
+    def count_until_blocked(self) -> int:
+        return sum(1 for _ in self.pour())
 
 
 def part_1(puzzle_input: str) -> str | int:
-    return Cave(puzzle_input, is_solid_floor=False).fill()
+    return Cave(puzzle_input, is_solid_floor=False).count_until_blocked()
 
 
 def part_2(puzzle_input: str) -> str | int:
-    return Cave(puzzle_input, is_solid_floor=True).fill()
+    return Cave(puzzle_input, is_solid_floor=True).count_until_blocked()
@@ -1,6 +1,12 @@
+import functools
 import re
 from typing import Iterable, NamedTuple, Optional
 
+import parallel
+
+# Scanning is only a fallback, at ~50us per row, so split up searches as big as the real one
+MIN_ROWS_PER_JOB = 100000
+
 
 class Range(NamedTuple):
     """Represents an inclusive integer range"""
@@ -98,45 +104,6 @@ def part_1(puzzle_input: str) -> str | int:
     return total
 
 
-class Segment(NamedTuple):
-    """Represents a diagonal (slope = 1 or -1) segment"""
-
-    start: Point  # Leftmost (min x) point
-    length: int  # Length (start.x + length) is x-coord last point on the segment)
-    is_positive_slope: bool  # Indicates if slope is 1 or -1
-
-    def intersect(self, other: "Segment") -> Optional[Point]:
-        """
-        For segments of differing slopes, calculate their intersection point (if any)
-        We ignore non-integer intersection points
-        """
-        if self.is_positive_slope == other.is_positive_slope:
-            return None
-
-        # Find intersection of the two lines
-        # y = x + b and y = -x + c intersect at x = (c - b) / 2
-        positive = next(seg for seg in (self, other) if seg.is_positive_slope)
-        positive_y_intercept = positive.start.y - positive.start.x
-
-        negative = next(seg for seg in (self, other) if not seg.is_positive_slope)
-        negative_y_intercept = negative.start.y + negative.start.x
-
-        y_intercept_diff = negative_y_intercept - positive_y_intercept
-        if y_intercept_diff % 2 == 1:
-            return None
-
-        x_intersection = y_intercept_diff // 2
-
-        if (
-            0 <= x_intersection - positive.start.x <= positive.length
-            and 0 <= x_intersection - negative.start.x <= negative.length
-        ):
-            y_intersection = positive.start.y + (x_intersection - positive.start.x)
-            return Point(x_intersection, y_intersection)
-
-        return None
-
-
 def can_have_mystery_beacon(point: Point, sensors: set[Sensor], bound: int) -> bool:
     if point.x < 0 or point.x > bound or point.y < 0 or point.y > bound:
         return False
@@ -149,51 +116,62 @@ def can_have_mystery_beacon(point: Point, sensors: set[Sensor], bound: int) -> b
     return True
 
 
+def find_uncovered_by_geometry(sensors: set[Sensor], bound: int) -> Optional[Point]:
+    """
+    In rotated coordinates u = x + y and v = x - y, each sensor's coverage is a square, and the
+    cells just outside it lie on two lines of constant u and two lines of constant v. A lone
+    uncovered cell has covered cells all around it, so (unless it's pinned against the edge
+    of the search area) it lies on a u line and a v line of the sensors next to it.
+    """
+    u_lines: set[int] = set()
+    v_lines: set[int] = set()
+    for sensor in sensors:
+        x, y = sensor.location
+        radius = sensor.location.distance_from(sensor.nearest_beacon) + 1
+        u_lines.update((x + y - radius, x + y + radius))
+        v_lines.update((x - y - radius, x - y + radius))
+
+    uncovered_points = set()
+    for u in u_lines:
+        for v in v_lines:
+            # Lines only cross at a cell if u and v have the same parity
+            if (u + v) % 2 == 0:
+                point = Point((u + v) // 2, (u - v) // 2)
+                if can_have_mystery_beacon(point, sensors, bound):
+                    uncovered_points.add(point)
+    return uncovered_points.pop() if len(uncovered_points) == 1 else None
+
+
+def scan_rows(sensors: set[Sensor], bound: int, rows: range) -> Optional[Point]:
+    """The first cell within the search area not covered by any sensor, checking row by row"""
+    for y in rows:
+        x = 0
+        for xrange in get_xranges_within_beacon_dist(sensors, y):
+            if xrange.low > x:
+                break
+            x = max(x, xrange.high + 1)
+        if x <= bound:
+            return Point(x, y)
+    return None
+
+
+def find_uncovered_by_scanning(
+    sensors: set[Sensor], bound: int, jobs: Optional[int] = None
+) -> Optional[Point]:
+    scan_chunk = functools.partial(scan_rows, sensors, bound)
+    results = parallel.map_in_chunks(scan_chunk, range(bound + 1), MIN_ROWS_PER_JOB, jobs)
+    found = [point for point in results if point is not None]
+    return min(found, key=lambda point: point.y) if found else None
+
+
 def tuning_frequency(point: Point) -> int:
     return 4000000 * point.x + point.y
 
 
 def part_2(puzzle_input: str) -> str | int:
-    # This part takes a minute to run, but I can't think of an asymptotically faster way to do it
     sensors = parse_input(puzzle_input)
     bound = 20 if len(sensors) == 14 else 4000000  # Different bounds for example and real cases
-
-    segments = []
-    for sensor in sensors:
-        center = sensor.location
-        radius = sensor.location.distance_from(sensor.nearest_beacon)
-        segments.append(
-            Segment(start=Point(center.x - radius, center.y), length=radius, is_positive_slope=True)
-        )
-        segments.append(
-            Segment(
-                start=Point(center.x - radius, center.y), length=radius, is_positive_slope=False
-            )
-        )
-        segments.append(
-            Segment(start=Point(center.x, center.y - radius), length=radius, is_positive_slope=True)
-        )
-        segments.append(
-            Segment(
-                start=Point(center.x, center.y + radius), length=radius, is_positive_slope=False
-            )
-        )
-
-    intersections = set()
-    for i in range(len(segments)):
-        for j in range(i + 1, len(segments)):
-            intersection = segments[i].intersect(segments[j])
-            if intersection:
-                intersections.add(intersection)
-
-    uncovered_points = set()
-    for intersection in intersections:
-        for delta_x, delta_y in ((0, 1), (1, 0), (0, -1), (-1, 0)):
-            neighbor = Point(intersection.x + delta_x, intersection.y + delta_y)
-            if can_have_mystery_beacon(neighbor, sensors, bound):
-                uncovered_points.add(neighbor)
-
-    if len(uncovered_points) != 1:
-        raise RuntimeError(f"Did not get exactly one candidate point: {uncovered_points}")
-
-    return tuning_frequency(uncovered_points.pop())
+    point = find_uncovered_by_geometry(sensors, bound) or find_uncovered_by_scanning(sensors, bound)
+    if point is None:
+        raise RuntimeError("Every point is covered by some sensor")
+    return tuning_frequency(point)
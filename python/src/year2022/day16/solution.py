@@ -1,101 +1,96 @@
 import re
-from functools import cache
-from typing import FrozenSet
+from typing import NamedTuple
 
-Valves = set[str]
-Flows = dict[str, int]
-Weights = dict[tuple[str, str], int]
-Graph = tuple[Valves, Flows, Weights]
+import numpy as np
+import numpy.typing as npt
 
+START = "AA"
 
-def get_raw_graph(text: str) -> Graph:
-    valves = set()
-    flows = {}
-    weights = {}
-    reg = r"Valve (\w+) has flow rate=(\d+); tunnels? leads? to valves? (.*)"
-    for valve, flow, neighbors in re.findall(reg, text):
-        valves.add(valve)
-        if flow != "0":
-            flows[valve] = int(flow)
-        for neighbor in neighbors.split(", "):
-            weights[(valve, neighbor)] = 1
-
-    return valves, flows, weights
-
-
-def densify_graph(graph: Graph) -> None:
-    # Add weights representing the pairwise-shortest paths between all nodes
-    valves, flows, weights = graph
-    for k in valves:
-        for i in valves:
-            for j in valves:
-                weights[i, j] = min(
-                    weights.get((i, j), 1000),
-                    weights.get((i, k), 1000) + weights.get((k, j), 1000),
-                )
-
-
-def make_get_max_flow(
-    graph: Graph,
-):
-    valves, flows, weights = graph
-
-    @cache
-    def _get_max_flow(
-        time_remaining: int,
-        start: str,
-        closed_valves: FrozenSet[str],
-        helper_time_remaining: int = 0,
-    ):
-        max_flow = 0
-        for next_valve in closed_valves:
-            if weights[start, next_valve] + 1 < time_remaining:
-                next_time_remaining = time_remaining - weights[start, next_valve] - 1
-                flow = flows[next_valve] * next_time_remaining + _get_max_flow(
-                    next_time_remaining,
-                    next_valve,
-                    closed_valves - {next_valve},
-                    helper_time_remaining,
-                )
-                max_flow = max(max_flow, flow)
-
-        # Alternatively, rely on the helper only
-        if helper_time_remaining > 0:
-            helper_flow = _get_max_flow(
-                helper_time_remaining,
-                "AA",
-                closed_valves,
-                0,
-            )
-            max_flow = max(max_flow, helper_flow)
-
-        return max_flow
-
-    return _get_max_flow
-
-
-get_max_flow = None
 
+class Tunnels(NamedTuple):
+    """
+    Only valves with positive flow are worth visiting, so each gets a bit index
+    The start valve gets the last index (after the useful valves) but no bit
+    """
 
-def part_1(puzzle_input: str) -> str | int:
-    graph = get_raw_graph(puzzle_input)
-    densify_graph(graph)
+    flows: list[int]
+    distances: list[list[int]]  # Shortest path lengths between useful valves and the start
 
-    global get_max_flow
-    if get_max_flow is None:
-        get_max_flow = make_get_max_flow(graph)
+    @property
+    def num_valves(self) -> int:
+        return len(self.flows)
 
-    useful_valves = frozenset(graph[1].keys())
-    return get_max_flow(30, "AA", useful_valves)
+    @property
+    def start(self) -> int:
+        return self.num_valves
 
 
-def part_2(puzzle_input: str) -> str | int:
-    graph = get_raw_graph(puzzle_input)
-    densify_graph(graph)
+def get_tunnels(puzzle_input: str) -> Tunnels:
+    reg = r"Valve (\w+) has flow rate=(\d+); tunnels? leads? to valves? (.*)"
+    rows = re.findall(reg, puzzle_input)
+    useful = [(valve, int(flow)) for valve, flow, _ in rows if flow != "0"]
+    # Useful valves first (in bit order), then the start, then everything else
+    order = [valve for valve, _ in useful] + [START]
+    order += [valve for valve, _, _ in rows if valve not in order]
+    indices = {valve: i for i, valve in enumerate(order)}
+
+    # Floyd-Warshall over a dense matrix, relaxing through one intermediate valve at a time
+    dist = np.full((len(order), len(order)), len(order), dtype=np.int32)
+    np.fill_diagonal(dist, 0)
+    for valve, _, neighbors in rows:
+        for neighbor in neighbors.split(", "):
+            dist[indices[valve], indices[neighbor]] = 1
+    for k in range(len(order)):
+        dist = np.minimum(dist, dist[:, k, None] + dist[None, k, :])
+
+    num_kept = len(useful) + 1
+    return Tunnels(
+        flows=[flow for _, flow in useful],
+        distances=dist[:num_kept, :num_kept].tolist(),
+    )
+
+
+def get_best_by_mask(tunnels: Tunnels, time_limit: int) -> npt.NDArray[np.int64]:
+    """
+    Most pressure released by a single walker that opens exactly the valves in each bitmask
+    (0 for sets of valves that can't all be opened in time)
+    """
+    flows, distances = tunnels.flows, tunnels.distances
+    best = [0] * (1 << tunnels.num_valves)
+
+    def visit(valve: int, time_left: int, opened: int, pressure: int) -> None:
+        if pressure > best[opened]:
+            best[opened] = pressure
+        from_valve = distances[valve]
+        for next_valve, flow in enumerate(flows):
+            bit = 1 << next_valve
+            next_time_left = time_left - from_valve[next_valve] - 1
+            if not opened & bit and next_time_left > 0:
+                visit(next_valve, next_time_left, opened | bit, pressure + flow * next_time_left)
+
+    visit(tunnels.start, time_limit, 0, 0)
+    return np.array(best, dtype=np.int64)
+
+
+def get_best_by_subset(best: npt.NDArray[np.int64], num_valves: int) -> npt.NDArray[np.int64]:
+    """Sum over subsets (with max instead of sum): the best of any subset of each bitmask"""
+    best = best.copy()
+    for bit in range(num_valves):
+        # Pair up every mask without this bit (axis 1 = 0) with the same mask plus the bit
+        pairs = best.reshape(-1, 2, 1 << bit)
+        np.maximum(pairs[:, 1, :], pairs[:, 0, :], out=pairs[:, 1, :])
+    return best
+
 
-    global get_max_flow
-    if get_max_flow is None:
-        get_max_flow = make_get_max_flow(graph)
+def part_1(puzzle_input: str) -> str | int:
+    tunnels = get_tunnels(puzzle_input)
+    return int(get_best_by_mask(tunnels, 30).max())
 
-    useful_valves = frozenset(graph[1].keys())
-    return get_max_flow(26, "AA", useful_valves, 26)
+
+def part_2(puzzle_input: str) -> str | int:
+    tunnels = get_tunnels(puzzle_input)
+    best = get_best_by_mask(tunnels, 26)
+    best_by_subset = get_best_by_subset(best, tunnels.num_valves)
+    # The elephant takes the best it can from the valves we didn't open. Reversing the array
+    # lines mask up with full ^ mask, since full ^ mask == full - mask
+    return int((best + best_by_subset[::-1]).max())
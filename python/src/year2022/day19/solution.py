@@ -1,27 +1,25 @@
+import functools
+import math
 import re
-from dataclasses import dataclass
-from typing import Any, FrozenSet, Optional
+from typing import NamedTuple
 
-import numpy as np
-import numpy.typing as npt
+import parallel
 
-# Mapping from {key}-mining robot, to the resources required to build it
-ResourceCounts = npt.NDArray[np.int32]  # Length-4 array of non-negative integers
-Inventory = ResourceCounts
-Fleet = ResourceCounts
-Blueprint = list[ResourceCounts]  # Length-4 array representing the cost of building resource {i}
+# A blueprint takes 2-20ms, so the 30 in a real input run fastest in a single process
+MIN_BLUEPRINTS_PER_JOB = 50
 
 
-def get_max_fleet(blueprint: Blueprint) -> Fleet:
-    max_fleet = np.array([50] * 4)  # Upper bound of 50 for all resource types will never be hit
-    # Note we do NOT place a max on geode-robots
-    for i in range(3):
-        max_fleet[i] = max(counts[i] for counts in blueprint)
-    return max_fleet
+class Blueprint(NamedTuple):
+    id: int
+    ore_robot_ore: int
+    clay_robot_ore: int
+    obsidian_robot_ore: int
+    obsidian_robot_clay: int
+    geode_robot_ore: int
+    geode_robot_obsidian: int
 
 
-def get_blueprints(puzzle_input: str) -> dict[int, Blueprint]:
-    blueprints = {}
+def get_blueprints(puzzle_input: str) -> list[Blueprint]:
     pattern = (
         r"Blueprint (\d+):\s+"
         r"Each ore robot costs (\d+) ore.\s+"
@@ -29,125 +27,148 @@ def get_blueprints(puzzle_input: str) -> dict[int, Blueprint]:
         r"Each obsidian robot costs (\d+) ore and (\d+) clay.\s+"
         r"Each geode robot costs (\d+) ore and (\d+) obsidian."
     )
-    for match in re.findall(pattern, puzzle_input):
-        match = list(map(int, match))
-        blueprints[match[0]] = [
-            np.array([match[1], 0, 0, 0]),
-            np.array([match[2], 0, 0, 0]),
-            np.array([match[3], match[4], 0, 0]),
-            np.array([match[5], 0, match[6], 0]),
-        ]
-
-    return blueprints
-
-
-@dataclass(frozen=True)
-class State:
-    inventory: Inventory
-    fleet: Fleet
-
-    def copy(self) -> "State":
-        return State(self.inventory.copy(), self.fleet.copy())
-
-    @property
-    def cache_key(self):
-        return tuple(self.inventory), tuple(self.fleet)
-
-
-def get_max_geodes(
-    blueprint: Blueprint,
-    state: State,
-    time_left: int,
-    *,
-    max_fleet: Fleet,
-    do_not_build: Optional[FrozenSet[int]] = None,
-    cache: Optional[dict[Any, int]] = None,
-) -> int:
-    """Note: we are allowed to modify inputs however we want"""
-    max_geodes = state.inventory[3]
-    if time_left <= 0:
-        return max_geodes
-
-    if cache is None:
-        cache = {}
-
-    # Clamp to maximum usable inventory
-    loss_rate = max_fleet - state.fleet
-    max_inventory = max_fleet + loss_rate * time_left
-    state = State(inventory=np.minimum(max_inventory, state.inventory), fleet=state.fleet)
-
-    cache_key = (state.cache_key, time_left)
-    if cache_key in cache:
-        return cache[cache_key]
-
-    buildable_robot_types = set()
-    for robot_type in range(4):
-        if (blueprint[robot_type] > state.inventory).any():
-            # Cannot build
-            continue
-        if state.fleet[robot_type] >= max_fleet[robot_type]:
-            # No need to build, already at max for this type
-            continue
-        buildable_robot_types.add(robot_type)
-
-    # Update inventory after calculating buildable robots
-    state = State(inventory=state.inventory + state.fleet, fleet=state.fleet)
-
-    # If we may be saving up for something, then consider building nothing
-    # Note: set do_not_build, because there is no point waiting to build something we can build now
-    if len(buildable_robot_types) < len(blueprint):
-        max_geodes = max(
-            max_geodes,
-            get_max_geodes(
-                blueprint,
-                state.copy(),
-                time_left - 1,
-                do_not_build=frozenset(buildable_robot_types),
-                cache=cache,
-                max_fleet=max_fleet,
-            ),
-        )
-
-    # Consider building one of the buildable types
-    for robot_type in buildable_robot_types:
-        if do_not_build and robot_type in do_not_build:
-            continue
-
-        next_inventory = state.inventory - blueprint[robot_type]
-        next_fleet = state.fleet.copy()
-        next_fleet[robot_type] += 1
-        next_state = State(inventory=next_inventory, fleet=next_fleet)
-        max_geodes = max(
-            max_geodes,
-            get_max_geodes(blueprint, next_state, time_left - 1, cache=cache, max_fleet=max_fleet),
-        )
-
-    cache[cache_key] = max_geodes
-    return max_geodes
+    return [Blueprint(*map(int, match)) for match in re.findall(pattern, puzzle_input)]
+
+
+def get_wait(cost: int, amount: int, rate: int) -> int:
+    """Minutes until we can afford cost, given the amount we have and how fast it grows"""
+    return 0 if amount >= cost else math.ceil((cost - amount) / rate)
+
+
+def get_max_geodes(blueprint: Blueprint, time_limit: int) -> int:
+    """
+    Depth first branch and bound, where each branch is "which robot to build next".
+    We then skip ahead to the minute it's built, rather than deciding minute by minute.
+    A geode robot's whole output is credited when it's built, so geode robots aren't tracked.
+    """
+    (
+        _,
+        ore_robot_ore,
+        clay_robot_ore,
+        obsidian_robot_ore,
+        obsidian_robot_clay,
+        geode_robot_ore,
+        geode_robot_obsidian,
+    ) = blueprint
+    # We can only spend so much of each resource per minute, so more robots never help
+    max_ore_robots = max(ore_robot_ore, clay_robot_ore, obsidian_robot_ore, geode_robot_ore)
+    max_clay_robots = obsidian_robot_clay
+    max_obsidian_robots = geode_robot_obsidian
+    best = 0
+
+    def get_upper_bound(time_left: int, obsidian: int, obsidian_robots: int, geodes: int) -> int:
+        """
+        Geodes we'd get if ore and clay were free, building a geode robot whenever we could
+        afford the obsidian, and otherwise an obsidian robot
+        """
+        for time_left in range(time_left - 1, 0, -1):
+            if obsidian >= geode_robot_obsidian:
+                obsidian += obsidian_robots - geode_robot_obsidian
+                geodes += time_left
+            else:
+                obsidian += obsidian_robots
+                obsidian_robots += 1
+        return geodes
+
+    def search(
+        time_left: int,
+        ore: int,
+        clay: int,
+        obsidian: int,
+        ore_robots: int,
+        clay_robots: int,
+        obsidian_robots: int,
+        geodes: int,
+    ) -> None:
+        nonlocal best
+        best = max(best, geodes)
+        if get_upper_bound(time_left, obsidian, obsidian_robots, geodes) <= best:
+            return
+
+        # Geode robot, which needs obsidian robots first
+        if obsidian_robots:
+            wait = 1 + max(
+                get_wait(geode_robot_ore, ore, ore_robots),
+                get_wait(geode_robot_obsidian, obsidian, obsidian_robots),
+            )
+            if wait < time_left:
+                search(
+                    time_left - wait,
+                    ore + ore_robots * wait - geode_robot_ore,
+                    clay + clay_robots * wait,
+                    obsidian + obsidian_robots * wait - geode_robot_obsidian,
+                    ore_robots,
+                    clay_robots,
+                    obsidian_robots,
+                    geodes + time_left - wait,
+                )
+
+        # Obsidian robot, which needs clay robots first
+        if clay_robots and obsidian_robots < max_obsidian_robots:
+            wait = 1 + max(
+                get_wait(obsidian_robot_ore, ore, ore_robots),
+                get_wait(obsidian_robot_clay, clay, clay_robots),
+            )
+            if wait < time_left:
+                search(
+                    time_left - wait,
+                    ore + ore_robots * wait - obsidian_robot_ore,
+                    clay + clay_robots * wait - obsidian_robot_clay,
+                    obsidian + obsidian_robots * wait,
+                    ore_robots,
+                    clay_robots,
+                    obsidian_robots + 1,
+                    geodes,
+                )
+
+        # Clay robot
+        if clay_robots < max_clay_robots:
+            wait = 1 + get_wait(clay_robot_ore, ore, ore_robots)
+            if wait < time_left:
+                search(
+                    time_left - wait,
+                    ore + ore_robots * wait - clay_robot_ore,
+                    clay + clay_robots * wait,
+                    obsidian + obsidian_robots * wait,
+                    ore_robots,
+                    clay_robots + 1,
+                    obsidian_robots,
+                    geodes,
+                )
+
+        # Ore robot
+        if ore_robots < max_ore_robots:
+            wait = 1 + get_wait(ore_robot_ore, ore, ore_robots)
+            if wait < time_left:
+                search(
+                    time_left - wait,
+                    ore + ore_robots * wait - ore_robot_ore,
+                    clay + clay_robots * wait,
+                    obsidian + obsidian_robots * wait,
+                    ore_robots + 1,
+                    clay_robots,
+                    obsidian_robots,
+                    geodes,
+                )
+
+    search(time_limit, 0, 0, 0, 1, 0, 0, 0)
+    return best
+
+
+def get_all_max_geodes(
+    blueprints: list[Blueprint], time_limit: int, jobs: int | None = None
+) -> list[int]:
+    """Blueprints are independent, so evaluate them in parallel when there are enough of them"""
+    max_geodes = functools.partial(get_max_geodes, time_limit=time_limit)
+    return parallel.map_items(max_geodes, blueprints, MIN_BLUEPRINTS_PER_JOB, jobs)
 
 
 def part_1(puzzle_input: str) -> str | int:
     blueprints = get_blueprints(puzzle_input)
-    total_quality = 0
-    for blueprint_id, blueprint in blueprints.items():
-        start_state = State(inventory=np.array([0, 0, 0, 0]), fleet=np.array([1, 0, 0, 0]))
-        max_fleet = get_max_fleet(blueprint)
-        max_geodes = get_max_geodes(blueprint, start_state, 24, max_fleet=max_fleet)
-        total_quality += blueprint_id * max_geodes
-    return total_quality
-
-
-# This is not speedy, it takes like 30 seconds to run
-# - Maintain a lower bound for the answer for a given blueprint, and prune when can't reach it.
-# - Branch based on "next robot type to build", rather than making a second-by-second decision.
+    max_geodes = get_all_max_geodes(blueprints, 24)
+    return sum(blueprint.id * geodes for blueprint, geodes in zip(blueprints, max_geodes))
+
+
 def part_2(puzzle_input: str) -> str | int:
-    blueprints = get_blueprints(puzzle_input)
-    total = 1
-    for blueprint_id, blueprint in blueprints.items():
-        if blueprint_id > 3:
-            continue
-        start_state = State(inventory=np.array([0, 0, 0, 0]), fleet=np.array([1, 0, 0, 0]))
-        max_fleet = get_max_fleet(blueprint)
-        max_geodes = get_max_geodes(blueprint, start_state, 32, max_fleet=max_fleet)
-        total *= max_geodes
-    return total
+    blueprints = [blueprint for blueprint in get_blueprints(puzzle_input) if blueprint.id <= 3]
+    return math.prod(get_all_max_geodes(blueprints, 32))
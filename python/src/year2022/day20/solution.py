@@ -1,51 +1,112 @@
+import math
+
 DECRYPTION_KEY = 811589153
 
 
-def parse_input(puzzle_input: str, multiplier: int = 1) -> list[tuple[int, int]]:
-    # Outputs are (elt, index with elements == elt)
-    seen: dict[int, int] = {}
-    output = []
-    for elt in map(int, puzzle_input.split("\n")):
-        index = seen.get(elt, -1) + 1
-        seen[elt] = index
-        output.append((elt * multiplier, index))
-    return output
+class MixingList:
+    """
+    Circular list of numbers, stored as blocks of about sqrt(n) numbers each
+    Numbers are identified by a handle (their index in the input), which never changes even
+    when there are duplicate values. A Fenwick tree over block sizes finds which block holds a
+    given position, so locating or moving a number costs O(log n) plus work within one block.
+    """
 
+    def __init__(self, values: list[int]):
+        self.values = values
+        self.block_size = max(1, math.isqrt(len(values)))
+        self._rebuild(list(range(len(values))))
 
-def mix(mutable: list[tuple[int, int]], elt: tuple[int, int]) -> None:
-    start_index = mutable.index(elt)
-    offset = elt[0] % (len(mutable) - 1)
-    target_index = start_index + offset
-    if target_index >= len(mutable):
-        # Add one on wraparound because the wrap itself does not skip any elements
-        target_index = (target_index % len(mutable)) + 1
+    def _rebuild(self, handles: list[int]) -> None:
+        """Re-splits the handles (in circular order) into evenly sized blocks"""
+        self.blocks = [
+            handles[start : start + self.block_size]
+            for start in range(0, len(handles), self.block_size)
+        ]
+        self.block_of = [0] * len(handles)
+        for block_idx, block in enumerate(self.blocks):
+            for handle in block:
+                self.block_of[handle] = block_idx
 
-    mutable.pop(start_index)
-    mutable.insert(target_index, elt)
+        # tree[i] holds the total size of blocks (i - lowbit(i), i], counting blocks from 1
+        self.tree = [0] * (len(self.blocks) + 1)
+        for block_idx, block in enumerate(self.blocks):
+            self._add(block_idx, len(block))
 
+    def _add(self, block_idx: int, delta: int) -> None:
+        i = block_idx + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
 
-def get_answer(mutable: list[tuple[int, int]]) -> int:
-    result = 0
-    start_index = mutable.index((0, 0))
-    for index in (1000, 2000, 3000):
-        result += mutable[(start_index + index) % len(mutable)][0]
-    return result
+    def _count_before(self, block_idx: int) -> int:
+        """Total size of the blocks before the given block"""
+        total = 0
+        i = block_idx
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
 
+    def _find(self, position: int) -> tuple[int, int]:
+        """The block holding the number at a position, and the number's offset in that block"""
+        block_idx = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            if block_idx + step < len(self.tree) and self.tree[block_idx + step] <= position:
+                block_idx += step
+                position -= self.tree[block_idx]
+            step >>= 1
+        return block_idx, position
 
-def part_1(puzzle_input: str) -> str | int:
-    original = parse_input(puzzle_input)
-    mutable = original.copy()
-    for elt in original:
-        mix(mutable, elt)
+    def position(self, handle: int) -> int:
+        block_idx = self.block_of[handle]
+        return self._count_before(block_idx) + self.blocks[block_idx].index(handle)
 
-    return get_answer(mutable)
+    def move(self, handle: int) -> None:
+        """Moves a number forward (or backward) by its value"""
+        block_idx = self.block_of[handle]
+        block = self.blocks[block_idx]
+        offset = block.index(handle)
+        position = self._count_before(block_idx) + offset
+        del block[offset]
+        self._add(block_idx, -1)
 
+        # Once removed, moving past all n - 1 other numbers gets back to where it started
+        block_idx, offset = self._find((position + self.values[handle]) % (len(self.values) - 1))
+        block = self.blocks[block_idx]
+        block.insert(offset, handle)
+        self._add(block_idx, 1)
+        self.block_of[handle] = block_idx
+        if len(block) > 2 * self.block_size:
+            self._rebuild(self.handles())
 
-def part_2(puzzle_input: str) -> str | int:
-    original = parse_input(puzzle_input, DECRYPTION_KEY)
-    mutable = original.copy()
-    for _ in range(10):
-        for elt in original:
-            mix(mutable, elt)
+    def handles(self) -> list[int]:
+        return [handle for block in self.blocks for handle in block]
+
+
+def parse_input(puzzle_input: str, multiplier: int = 1) -> list[int]:
+    return [int(line) * multiplier for line in puzzle_input.split("\n")]
+
+
+def get_answer(values: list[int], mixing_list: MixingList) -> int:
+    handles = mixing_list.handles()
+    start_index = mixing_list.position(values.index(0))
+    return sum(
+        values[handles[(start_index + index) % len(handles)]] for index in (1000, 2000, 3000)
+    )
 
-    return get_answer(mutable)
+
+def mix(values: list[int], num_rounds: int) -> int:
+    mixing_list = MixingList(values)
+    for _ in range(num_rounds):
+        for handle in range(len(values)):
+            mixing_list.move(handle)
+    return get_answer(values, mixing_list)
+
+
+def part_1(puzzle_input: str) -> str | int:
+    return mix(parse_input(puzzle_input), 1)
+
+
+def part_2(puzzle_input: str) -> str | int:
+    return mix(parse_input(puzzle_input, DECRYPTION_KEY), 10)
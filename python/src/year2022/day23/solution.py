@@ -1,6 +1,12 @@
-from collections import defaultdict
 from enum import Enum
-from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+Cells = npt.NDArray[np.bool_]
+
+# Extra empty cells added on each side when elves get close to the edge of the field
+GROWTH = 16
 
 
 class Direction(Enum):
@@ -14,106 +20,98 @@ class Direction(Enum):
     WEST = (0, -1)
 
 
-class Point(NamedTuple):
-    row: int
-    col: int
-
-
-Elves = set[Point]
-
-
-def parse_input(text: str) -> Elves:
-    output = set()
-    for row, line in enumerate(text.split("\n")):
-        for col, char in enumerate(line):
-            if char == "#":
-                output.add(Point(row, col))
-    return output
-
-
-def get_occupied_directions(elves: Elves, point: Point) -> set[Direction]:
-    return {
-        direction
-        for direction in Direction
-        if Point(point.row + direction.value[0], point.col + direction.value[1]) in elves
-    }
-
-
-def get_proposed_move(elves: Elves, point: Point, directions: list[Direction]) -> Point:
-    occupied_dirs = get_occupied_directions(elves, point)
-    if not occupied_dirs:
-        # Space in all directions, no need to move
-        return point
-
-    for direction in directions:
-        # Check spot to move to
-        if direction in occupied_dirs:
-            continue
-
-        # Check diagonals too
-        if direction == Direction.NORTH:
-            if Direction.NORTHWEST in occupied_dirs or Direction.NORTHEAST in occupied_dirs:
-                continue
-        elif direction == Direction.SOUTH:
-            if Direction.SOUTHWEST in occupied_dirs or Direction.SOUTHEAST in occupied_dirs:
-                continue
-        elif direction == Direction.WEST:
-            if Direction.NORTHWEST in occupied_dirs or Direction.SOUTHWEST in occupied_dirs:
-                continue
-        elif direction == Direction.EAST:
-            if Direction.NORTHEAST in occupied_dirs or Direction.SOUTHEAST in occupied_dirs:
-                continue
-
-        # Found the direction to move in
-        return Point(point.row + direction.value[0], point.col + direction.value[1])
-
-    # Can't move anywhere, stay still
-    return point
-
-
-def full_step(elves: Elves, directions: list[Direction]) -> Elves:
-    # First calculate the proposals
-    proposed_targets = defaultdict(set)  # Maps targets to elves proposing move to there
-    for elf in elves:
-        target = get_proposed_move(elves, elf, directions)
-        proposed_targets[target].add(elf)
-
-    # Then resolve the proposals
-    output = set()
-    for target, elves_targeting in proposed_targets.items():
-        if len(elves_targeting) == 1:
-            # No conflict, elf can move to this target
-            output.add(target)
-        elif len(elves_targeting) > 1:
-            # Conflict, elves should stay where they are
-            output.update(elves_targeting)
-    return output
-
-
-def get_space_in_bounding_box(elves: Elves) -> int:
-    height = max(elf.row for elf in elves) - min(elf.row for elf in elves) + 1
-    width = max(elf.col for elf in elves) - min(elf.col for elf in elves) + 1
-    return height * width - len(elves)
+# Each direction an elf can move in, with the neighbors that must be empty to move that way
+MOVES = {
+    Direction.NORTH: (Direction.NORTHWEST, Direction.NORTH, Direction.NORTHEAST),
+    Direction.SOUTH: (Direction.SOUTHWEST, Direction.SOUTH, Direction.SOUTHEAST),
+    Direction.WEST: (Direction.NORTHWEST, Direction.WEST, Direction.SOUTHWEST),
+    Direction.EAST: (Direction.NORTHEAST, Direction.EAST, Direction.SOUTHEAST),
+}
+
+# Only elves moving in opposite directions can propose the same cell (e.g. an elf moving east
+# into a cell needs the cell's north, south and west neighbors to be empty)
+OPPOSITES = [(Direction.NORTH, Direction.SOUTH), (Direction.WEST, Direction.EAST)]
+
+
+def get_slices(offset: int, size: int) -> tuple[slice, slice]:
+    """Destination and source slices along one axis for shifting by offset"""
+    return slice(max(offset, 0), size + min(offset, 0)), slice(
+        max(-offset, 0), size - max(offset, 0)
+    )
+
+
+def shift(cells: Cells, d_row: int, d_col: int) -> Cells:
+    """Moves every cell by the given offset, filling in with empty cells"""
+    to_rows, from_rows = get_slices(d_row, cells.shape[0])
+    to_cols, from_cols = get_slices(d_col, cells.shape[1])
+    shifted = np.zeros_like(cells)
+    shifted[to_rows, to_cols] = cells[from_rows, from_cols]
+    return shifted
+
+
+class Field:
+    """
+    Elves as a boolean array, with every elf stepped at once using whole-array operations
+    The array always keeps a ring of empty cells around the elves, growing as they spread out.
+    """
+
+    def __init__(self, text: str):
+        self.cells = np.array([[char == "#" for char in line] for line in text.split("\n")])
+        self.directions = [Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST]
+
+    def _ensure_margin(self) -> None:
+        cells = self.cells
+        if cells[0].any() or cells[-1].any() or cells[:, 0].any() or cells[:, -1].any():
+            self.cells = np.pad(cells, GROWTH)
+
+    def step(self) -> bool:
+        """Runs one round, returning whether any elf moved"""
+        self._ensure_margin()
+        cells = self.cells
+        # occupied[d] is set for cells whose neighbor in direction d has an elf
+        occupied = {}
+        for direction in Direction:
+            d_row, d_col = direction.value
+            occupied[direction] = shift(cells, -d_row, -d_col)
+
+        # Elves with any neighbors try each direction in turn
+        undecided = cells & np.logical_or.reduce(list(occupied.values()))
+        targets: dict[Direction, Cells] = {}
+        for direction in self.directions:
+            blocked = np.logical_or.reduce([occupied[neighbor] for neighbor in MOVES[direction]])
+            proposing = undecided & ~blocked
+            undecided &= blocked
+            targets[direction] = shift(proposing, *direction.value)
+        self.directions.append(self.directions.pop(0))
+
+        moved = False
+        for first, second in OPPOSITES:
+            contested = targets[first] & targets[second]
+            for direction in (first, second):
+                accepted = targets[direction] & ~contested
+                if accepted.any():
+                    moved = True
+                    d_row, d_col = direction.value
+                    cells &= ~shift(accepted, -d_row, -d_col)
+                    cells |= accepted
+        return moved
+
+    def get_empty_in_bounding_box(self) -> int:
+        rows, cols = np.nonzero(self.cells)
+        area = (rows.max() - rows.min() + 1) * (cols.max() - cols.min() + 1)
+        return int(area - len(rows))
 
 
 def part_1(puzzle_input: str) -> str | int:
-    elves = parse_input(puzzle_input)
-    directions = [Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST]
+    field = Field(puzzle_input)
     for _ in range(10):
-        elves = full_step(elves, directions)
-        directions.append(directions.pop(0))
-    return get_space_in_bounding_box(elves)
+        field.step()
+    return field.get_empty_in_bounding_box()
 
 
 def part_2(puzzle_input: str) -> str | int:
-    elves = parse_input(puzzle_input)
-    directions = [Direction.NORTH, Direction.SOUTH, Direction.WEST, Direction.EAST]
-    num_steps = 0
-    while True:
-        new_elves = full_step(elves.copy(), directions)
-        directions.append(directions.pop(0))
+    field = Field(puzzle_input)
+    num_steps = 1
+    while field.step():
         num_steps += 1
-        if elves == new_elves:
-            return num_steps
-        else:
-            elves = new_elves
+    return num_steps
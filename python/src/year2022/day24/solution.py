@@ -1,171 +1,99 @@
-from collections import deque
-from enum import Enum
-from typing import NamedTuple
-
-
-class Direction(Enum):
-    UP = (-1, 0)
-    DOWN = (1, 0)
-    LEFT = (0, -1)
-    RIGHT = (0, 1)
-
-
-class Point(NamedTuple):
-    row: int
-    col: int
-
-
-START = Point(0, 1)
-
-
-class Blizzard(NamedTuple):
-    location: Point
-    direction: Direction
-
-
-def parse_input(text: str) -> tuple[set[Blizzard], int, int]:
-    """Return the blizzards, the max row we can visit, and the max col we can visit"""
-    lines = text.split("\n")
-    max_row = len(lines) - 2  # Minus two because last row is inaccessible
-    max_col = len(lines[0]) - 2  # Minus two because last col is inaccessible
-    blizzards = set()
-    for row, line in enumerate(lines):
-        for col, char in enumerate(line):
-            point = Point(row, col)
-            match char:
-                case "<":
-                    blizzards.add(Blizzard(point, Direction.LEFT))
-                case ">":
-                    blizzards.add(Blizzard(point, Direction.RIGHT))
-                case "v":
-                    blizzards.add(Blizzard(point, Direction.DOWN))
-                case "^":
-                    blizzards.add(Blizzard(point, Direction.UP))
-                case ".":
-                    # Open space, not a blizzard
-                    pass
-                case "#":
-                    # Wall, not a blizzard
-                    pass
-                case _:
-                    raise ValueError(f"Unexpected input {char=}")
-
-    return blizzards, max_row, max_col
-
-
 class Forecast:
-    """Class to lazily compute the forecast as far out as we need"""
-
-    def __init__(self, initial_blizzards: set[Blizzard], *, max_row: int, max_col: int):
-        # self._blizzards represents state after self._num_steps
-        self._blizzards = initial_blizzards
-        self._num_steps = 0
-
-        self._min_row = 1
-        self._max_row = max_row
-        self._min_col = 1
-        self._max_col = max_col
-        self._start = Point(self._min_row - 1, self._min_col)
-        self._end = Point(self._max_row + 1, self._max_col)
-
-        # Tracks what forecasted free spots exist: elements are (location, time)
-        self._free_spots: set[tuple[Point, int]] = set()
-        self._record_free_spots()
-
-    def _record_free_spots(self) -> None:
-        # Start by finding all spots (including the start and end)
-        free_spots = {self._start, self._end}
-        for row in range(self._min_row, self._max_row + 1):
-            for col in range(self._min_col, self._max_col + 1):
-                free_spots.add(Point(row, col))
-
-        # Now remove all the spots that are not actually free
-        for blizzard in self._blizzards:
-            if blizzard.location in free_spots:
-                free_spots.remove(blizzard.location)
-
-        # Now update the stored free spots
-        for spot in free_spots:
-            self._free_spots.add((spot, self._num_steps))
-
-    def _next_blizzard(self, blizzard: Blizzard) -> Blizzard:
-        next_row = blizzard.location.row + blizzard.direction.value[0]
-        if next_row < self._min_row:
-            next_row = self._max_row
-        elif next_row > self._max_row:
-            next_row = self._min_row
-
-        next_col = blizzard.location.col + blizzard.direction.value[1]
-        if next_col < self._min_col:
-            next_col = self._max_col
-        elif next_col > self._max_col:
-            next_col = self._min_col
-
-        return Blizzard(Point(next_row, next_col), blizzard.direction)
-
-    def _next_step(self) -> None:
-        self._blizzards = {self._next_blizzard(blizzard) for blizzard in self._blizzards}
-        self._num_steps += 1
-        self._record_free_spots()
-
-    def _is_in_bounds(self, point: Point) -> bool:
-        if point in (self._start, self._end):
-            return True
-        return (
-            self._min_row <= point.row <= self._max_row
-            and self._min_col <= point.col <= self._max_col
-        )
-
-    def is_free(self, point: Point, time: int) -> bool:
-        if not self._is_in_bounds(point):
-            return False
-
-        while self._num_steps < time:
-            self._next_step()
-
-        return (point, time) in self._free_spots
+    """
+    Blizzards as per-row bitmasks (bit c set if there's a blizzard in column c)
+    Blizzards never leave their row or column, so where they are at any time is just a
+    rotation: horizontal blizzards rotate within the row's mask (period = width), and vertical
+    blizzards keep their column but move to another row's mask (period = height).
+    """
+
+    def __init__(self, puzzle_input: str):
+        # Only the interior, without the surrounding walls
+        lines = [line[1:-1] for line in puzzle_input.split("\n")[1:-1]]
+        self.height = len(lines)
+        self.width = len(lines[0])
+        self.full_row = (1 << self.width) - 1
+
+        self.left = [0] * self.height
+        self.right = [0] * self.height
+        self.up = [0] * self.height
+        self.down = [0] * self.height
+        for row, line in enumerate(lines):
+            for col, char in enumerate(line):
+                match char:
+                    case "<":
+                        self.left[row] |= 1 << col
+                    case ">":
+                        self.right[row] |= 1 << col
+                    case "^":
+                        self.up[row] |= 1 << col
+                    case "v":
+                        self.down[row] |= 1 << col
+                    case ".":
+                        pass
+                    case _:
+                        raise ValueError(f"Unexpected input {char=}")
+
+    def _rotate(self, mask: int, shift: int) -> int:
+        """Moves bit c to bit (c + shift) mod width"""
+        shift %= self.width
+        return ((mask << shift) | (mask >> (self.width - shift))) & self.full_row
+
+    def free_rows(self, time: int) -> list[int]:
+        """Per-row bitmasks of the cells with no blizzard at the given time"""
+        height = self.height
+        return [
+            ~(
+                self._rotate(self.right[row], time)
+                | self._rotate(self.left[row], -time)
+                | self.down[(row - time) % height]
+                | self.up[(row + time) % height]
+            )
+            & self.full_row
+            for row in range(height)
+        ]
 
 
-def get_path_length(start: Point, end: Point, start_time: int, forecast: Forecast) -> int:
-    queue = deque([(start, start_time)])
-    seen = {(start, start_time)}
-    while queue:
-        location, time = queue.popleft()
+def get_path_length(forecast: Forecast, start_time: int, downward: bool) -> int:
+    """
+    Time at which we can first reach the exit, setting off at start_time
+    Rather than searching states one at a time, the frontier is every cell we could be in at
+    the current time, as per-row bitmasks, all advanced together each minute
+    The start is above the top left cell and the end is below the bottom right cell
+    """
+    top_left = (0, 1)
+    bottom_right = (forecast.height - 1, 1 << (forecast.width - 1))
+    (entry_row, entry_bit), (exit_row, exit_bit) = (
+        (top_left, bottom_right) if downward else (bottom_right, top_left)
+    )
+
+    time = start_time
+    frontier = [0] * forecast.height
+    while not frontier[exit_row] & exit_bit:
         time += 1
-        neighbors = [location] + [
-            Point(location.row + direction.value[0], location.col + direction.value[1])
-            for direction in Direction
+        free = forecast.free_rows(time)
+        frontier = [
+            (
+                cells
+                | (cells << 1)
+                | (cells >> 1)
+                | (frontier[row - 1] if row > 0 else 0)
+                | (frontier[row + 1] if row + 1 < forecast.height else 0)
+            )
+            & free[row]
+            for row, cells in enumerate(frontier)
         ]
-        for neighbor in neighbors:
-            if neighbor == end:
-                return time
-
-            node = (neighbor, time)
-            if node in seen:
-                continue
-            else:
-                seen.add(node)
-
-            if forecast.is_free(neighbor, time):
-                queue.append(node)
-
-    raise RuntimeError("Could not find any path")
+        # We can wait outside the valley for as long as we like before stepping in
+        frontier[entry_row] |= entry_bit & free[entry_row]
+    return time + 1  # One more step out of the valley
 
 
 def part_1(puzzle_input: str) -> str | int:
-    blizzards, max_row, max_col = parse_input(puzzle_input)
-    start = Point(0, 1)
-    end = Point(max_row + 1, max_col)
-    forecast = Forecast(blizzards, max_row=max_row, max_col=max_col)
-    return get_path_length(start, end, 0, forecast)
+    forecast = Forecast(puzzle_input)
+    return get_path_length(forecast, 0, downward=True)
 
 
 def part_2(puzzle_input: str) -> str | int:
-    blizzards, max_row, max_col = parse_input(puzzle_input)
-    start = Point(0, 1)
-    end = Point(max_row + 1, max_col)
-    forecast = Forecast(blizzards, max_row=max_row, max_col=max_col)
-
-    first_leg_time = get_path_length(start, end, 0, forecast)
-    second_leg_time = get_path_length(end, start, first_leg_time, forecast)
-    return get_path_length(start, end, second_leg_time, forecast)
+    forecast = Forecast(puzzle_input)
+    first_leg_time = get_path_length(forecast, 0, downward=True)
+    second_leg_time = get_path_length(forecast, first_leg_time, downward=False)
+    return get_path_length(forecast, second_leg_time, downward=True)
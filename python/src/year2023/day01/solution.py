@@ -1,3 +1,11 @@
+from matcher import Matcher
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+ENCODINGS = {str(digit): digit for digit in range(10)}
+ENCODINGS.update({word: digit for digit, word in enumerate(DIGIT_WORDS, 1)})
+ENCODING_MATCHER = Matcher(ENCODINGS)
+
+
 def part_1_value(line: str) -> int:
     digits = [int(chr) for chr in line if chr in "0123456789"]
     return 10 * digits[0] + digits[-1]
@@ -8,26 +16,11 @@ def part_1(puzzle_input: str) -> str | int:
 
 
 def part_2_value(line: str) -> int:
-    encodings = {str(digit): digit for digit in range(10)}
-    encodings.update(
-        {
-            "one": 1,
-            "two": 2,
-            "three": 3,
-            "four": 4,
-            "five": 5,
-            "six": 6,
-            "seven": 7,
-            "eight": 8,
-            "nine": 9,
-        }
+    digits = sorted(
+        (start, ENCODINGS[ENCODING_MATCHER.patterns[idx]])
+        for start, idx in ENCODING_MATCHER.find_all(line)
     )
-    digits = []
-    for idx in range(len(line)):
-        for encoding, value in encodings.items():
-            if line[idx : idx + len(encoding)] == encoding:
-                digits.append(value)
-    return 10 * digits[0] + digits[-1]
+    return 10 * digits[0][1] + digits[-1][1]
 
 
 def part_2(puzzle_input: str) -> str | int:
@@ -1,7 +1,10 @@
-import itertools
+import bisect
 from dataclasses import dataclass
 from functools import reduce
 
+import numpy as np
+import numpy.typing as npt
+
 
 @dataclass(frozen=True)
 class Range:
@@ -12,101 +15,98 @@ class Range:
     def end(self) -> int:
         return self.start + self.length - 1
 
-    def overlap(self, other: "Range") -> "Range | None":
-        if self.start > other.end:
-            # No overlap
-            return None
-        if other.start > self.end:
-            # No overlap
-            return None
-
-        overlap_start = max(self.start, other.start)
-        overlap_end = min(self.end, other.end)
-        overlap_length = overlap_end - overlap_start + 1
-        return Range(overlap_start, overlap_length)
-
 
 @dataclass(frozen=True)
-class RangeMapEntry:
-    src_start: int
-    dest_start: int
-    length: int
-
-    @property
-    def src_range(self) -> Range:
-        return Range(self.src_start, self.length)
-
+class PiecewiseMap:
+    """
+    Maps non-negative integers by adding an offset that's constant over each piece
+    Piece i covers [starts[i], starts[i + 1]), and the last piece runs forever. The first piece
+    always starts at 0, so every value falls in some piece.
+    """
 
-@dataclass
-class RangeMap:
-    entries: set[RangeMapEntry]
+    starts: list[int]
+    offsets: list[int]
 
     @classmethod
-    def from_section(cls, text: str) -> "RangeMap":
+    def from_section(cls, text: str) -> "PiecewiseMap":
         # Skip header line
-        entries: set[RangeMapEntry] = set()
+        entries = []
         for line in text.split("\n")[1:]:
             dest_start, src_start, length = map(int, line.split())
-            entries.add(RangeMapEntry(src_start, dest_start, length))
-        return cls(entries)
-
-    def apply(self, src_value: int) -> int:
-        for entry in self.entries:
-            if 0 <= (offset := src_value - entry.src_start) < entry.length:
-                return entry.dest_start + offset
-        return src_value
-
-    def apply_range(self, src_range: Range) -> set[Range]:
-        range_mappings: dict[Range, Range] = {}
-        for entry in sorted(self.entries, key=lambda entry: entry.src_start):
-            if (overlap := entry.src_range.overlap(src_range)) is not None:
-                offset = overlap.start - entry.src_start
-                range_mappings[overlap] = Range(entry.dest_start + offset, overlap.length)
-
-        # Let's not forget subranges of the unmapped input range that are unmapped
-        # Those ranges should pass through unchanged
-        # Add a dummy range before and after src_range to serve as bookends for finding gaps
-        mapped_src_ranges = sorted(range_mappings.keys(), key=lambda r: r.start)
-        mapped_src_ranges.insert(0, Range(src_range.start - 1, 1))
-        mapped_src_ranges.append(Range(src_range.end + 1, 1))
-        unmapped_ranges: set[Range] = set()
-        for idx in range(len(mapped_src_ranges) - 1):
-            gap_length = mapped_src_ranges[idx + 1].start - mapped_src_ranges[idx].end - 1
-            if gap_length > 0:
-                unmapped_ranges.add(Range(mapped_src_ranges[idx].end + 1, gap_length))
-
-        return set(range_mappings.values()) | unmapped_ranges
-
-
-def parse_input(puzzle_input: str) -> tuple[list[int], list[RangeMap]]:
+            entries.append((src_start, dest_start - src_start, length))
+
+        # Values outside of every entry are unchanged, so fill the gaps with zero offsets
+        starts, offsets = [0], [0]
+        for src_start, offset, length in sorted(entries):
+            if src_start == starts[-1]:
+                offsets[-1] = offset
+            else:
+                starts.append(src_start)
+                offsets.append(offset)
+            starts.append(src_start + length)
+            offsets.append(0)
+        return cls(starts, offsets)
+
+    def then(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        """The map that applies this map followed by other"""
+        starts: list[int] = []
+        offsets: list[int] = []
+        for idx, (start, offset) in enumerate(zip(self.starts, self.offsets)):
+            end = self.starts[idx + 1] if idx + 1 < len(self.starts) else None
+
+            # Split this piece wherever its image crosses the start of one of other's pieces
+            other_idx = bisect.bisect_right(other.starts, start + offset) - 1
+            while True:
+                combined_offset = offset + other.offsets[other_idx]
+                if not offsets or offsets[-1] != combined_offset:
+                    starts.append(max(start, other.starts[other_idx] - offset))
+                    offsets.append(combined_offset)
+                other_idx += 1
+                if other_idx == len(other.starts):
+                    break
+                if end is not None and other.starts[other_idx] - offset >= end:
+                    break
+        return PiecewiseMap(starts, offsets)
+
+    def apply(self, value: int) -> int:
+        return value + self.offsets[bisect.bisect_right(self.starts, value) - 1]
+
+    def apply_many(self, values: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+        indices = np.searchsorted(np.array(self.starts), values, side="right") - 1
+        return values + np.array(self.offsets)[indices]
+
+    def apply_range(self, src_range: Range) -> list[Range]:
+        """Images of the parts of src_range that fall in each piece, in order of source"""
+        ranges: list[Range] = []
+        idx = bisect.bisect_right(self.starts, src_range.start) - 1
+        while idx < len(self.starts) and self.starts[idx] <= src_range.end:
+            start = max(src_range.start, self.starts[idx])
+            end = src_range.end if idx + 1 == len(self.starts) else self.starts[idx + 1] - 1
+            end = min(end, src_range.end)
+            ranges.append(Range(start + self.offsets[idx], end - start + 1))
+            idx += 1
+        return ranges
+
+
+def parse_input(puzzle_input: str) -> tuple[list[int], PiecewiseMap]:
+    """Returns the seed numbers, and every map composed into one seed to location map"""
     seed_section, *map_sections = puzzle_input.split("\n\n")
     seeds = [int(part) for part in seed_section.split() if part.isdigit()]
-    range_maps = [RangeMap.from_section(section) for section in map_sections]
-    return seeds, range_maps
-
-
-def get_location(seed: int, range_maps: list[RangeMap]) -> int:
-    return reduce(lambda val, range_map: range_map.apply(val), range_maps, seed)
-
-
-def get_location_ranges(seed_range: Range, range_maps: list[RangeMap]) -> set[Range]:
-    return reduce(
-        lambda ranges, range_map: set(itertools.chain(*(range_map.apply_range(r) for r in ranges))),
-        range_maps,
-        {seed_range},
-    )
+    range_maps = [PiecewiseMap.from_section(section) for section in map_sections]
+    return seeds, reduce(PiecewiseMap.then, range_maps)
 
 
 def part_1(puzzle_input: str) -> str | int:
-    seeds, range_maps = parse_input(puzzle_input)
-    return min(get_location(seed, range_maps) for seed in seeds)
+    seeds, seed_to_location = parse_input(puzzle_input)
+    return min(seed_to_location.apply(seed) for seed in seeds)
 
 
 def part_2(puzzle_input: str) -> str | int:
-    seed_vals, range_maps = parse_input(puzzle_input)
-    location_ranges: set[Range] = set()
-    for idx in range(len(seed_vals) // 2):
-        seed_range = Range(seed_vals[2 * idx], seed_vals[2 * idx + 1])
-        location_ranges.update(get_location_ranges(seed_range, range_maps))
-
-    return min(r.start for r in location_ranges)
+    seed_vals, seed_to_location = parse_input(puzzle_input)
+    return min(
+        location_range.start
+        for idx in range(0, len(seed_vals), 2)
+        for location_range in seed_to_location.apply_range(
+            Range(seed_vals[idx], seed_vals[idx + 1])
+        )
+    )
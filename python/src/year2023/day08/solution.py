@@ -2,6 +2,8 @@ import math
 import re
 from typing import TypeAlias
 
+import cycles
+
 Graph: TypeAlias = dict[str, tuple[str, str]]
 
 
@@ -32,23 +34,15 @@ def follow_path(instructions: str, graph: Graph) -> int:
     return num_steps
 
 
-def get_cycle(instructions: str, graph: Graph, start_node: str) -> tuple[int, int]:
-    """Return the cycle start index, the cycle length, and the"""
-
-    # For each (node, instruction idx) track the time we saw it
-    last_seen: dict[tuple[str, int], int] = {}
-    num_steps = 0
-    node = start_node
-    while (node, inst_idx := num_steps % len(instructions)) not in last_seen:
-        # Record this step
-        last_seen[(node, inst_idx)] = num_steps
+def get_cycle(instructions: str, graph: Graph, start_node: str) -> cycles.Cycle:
+    """Where the walk from start_node starts repeating, with states of (node, instruction idx)"""
 
-        # Take the next step
-        num_steps += 1
-        node = graph[node][0] if instructions[inst_idx] == "L" else graph[node][1]
+    def step(state: tuple[str, int]) -> tuple[str, int]:
+        node, inst_idx = state
+        next_node = graph[node][0] if instructions[inst_idx] == "L" else graph[node][1]
+        return next_node, (inst_idx + 1) % len(instructions)
 
-    cycle_start = last_seen[(node, inst_idx)]
-    return cycle_start, num_steps - cycle_start
+    return cycles.find_cycle((start_node, 0), step)
 
 
 def find_goal_remainders(
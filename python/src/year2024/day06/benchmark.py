@@ -0,0 +1,66 @@
+"""
+Compare loop detection approaches for part 2 on the full puzzle input
+Run from python/src with: python -m year2024.day06.benchmark
+"""
+import argparse
+
+import bench
+import parallel
+from runner import Puzzle, get_input
+from year2024.day06 import solution
+
+
+def count_loops_stepwise(puzzle_input: str) -> int:
+    """Place each candidate obstacle in turn and walk the guard one cell at a time"""
+    area, position, direction = solution.parse_input(puzzle_input)
+    num_loops = 0
+    for obstacle, start, start_direction in solution.get_candidates(area, position, direction):
+        original = area[obstacle]
+        area[obstacle] = solution.OBSTACLE
+        num_loops += solution.has_loop(area, start, start_direction)
+        area[obstacle] = original
+    return num_loops
+
+
+def count_loops_with_jump_table(puzzle_input: str) -> int:
+    area, position, direction = solution.parse_input(puzzle_input)
+    return solution.count_loops(area, solution.get_candidates(area, position, direction))
+
+
+def count_loops_with_jump_table_in_parallel(puzzle_input: str, jobs: int) -> int:
+    area, position, direction = solution.parse_input(puzzle_input)
+    candidates = solution.get_candidates(area, position, direction)
+    return solution.count_loops_in_parallel(area, candidates, jobs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Benchmark 2024 Day 06 loop detection")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=4)
+    args = parser.parse_args()
+
+    puzzle_input = get_input(Puzzle(2024, 6), 2, example=False)
+    # The solution caps the job count so each job gets enough candidates; report what ran
+    area, position, direction = solution.parse_input(puzzle_input)
+    num_candidates = len(solution.get_candidates(area, position, direction))
+    jobs = parallel.get_num_jobs(num_candidates, solution.MIN_CANDIDATES_PER_JOB, args.jobs)
+    results = [
+        bench.bench_solution(count_loops_stepwise, puzzle_input, "Stepwise", args.runs, 0),
+        bench.bench_solution(count_loops_with_jump_table, puzzle_input, "Jump table", args.runs, 1),
+        bench.bench_solution(
+            lambda text: count_loops_with_jump_table_in_parallel(text, args.jobs),
+            puzzle_input,
+            f"Jump table ({jobs} jobs)",
+            args.runs,
+            1,
+        ),
+    ]
+    assert len({result.result for result in results}) == 1, "Approaches disagree"
+
+    baseline = results[0]
+    for result in results:
+        print(f"{result.to_str()} [{baseline.median_ns / result.median_ns:.1f}x]")
+
+
+if __name__ == "__main__":
+    main()
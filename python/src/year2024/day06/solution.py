@@ -1,128 +1,136 @@
-from dataclasses import dataclass
-from enum import Enum
-
-
-class Direction(Enum):
-    UP = "^"
-    RIGHT = ">"
-    DOWN = "v"
-    LEFT = "<"
-
-    def turn_right(self) -> "Direction":
-        dirs = (Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.LEFT)
-        idx = dirs.index(self)
-        next_idx = (idx + 1) % len(dirs)
-        return dirs[next_idx]
-
-
-@dataclass(frozen=True)
-class Location:
-    row: int
-    col: int
-
-    def step(self, direction: Direction) -> "Location":
-        match direction:
-            case Direction.UP:
-                return Location(self.row - 1, self.col)
-            case Direction.DOWN:
-                return Location(self.row + 1, self.col)
-            case Direction.LEFT:
-                return Location(self.row, self.col - 1)
-            case Direction.RIGHT:
-                return Location(self.row, self.col + 1)
-
-
-@dataclass(frozen=True)
-class GuardState:
-    location: Location
-    direction: Direction
-
-
-@dataclass
-class Area:
-    num_rows: int
-    num_cols: int
-    obstacles: set[Location]
-
-    def is_in_bounds(self, location) -> bool:
-        return 0 <= location.row < self.num_rows and 0 <= location.col < self.num_cols
-
-    def next_guard_state(self, guard: GuardState) -> GuardState:
-        next_guard_direction = guard.direction
-        while (next_guard_location := guard.location.step(next_guard_direction)) in self.obstacles:
-            next_guard_direction = next_guard_direction.turn_right()
-        return GuardState(next_guard_location, next_guard_direction)
-
-    def to_str(self, guard: GuardState) -> str:
-        row_strs: list[str] = []
-        for row_idx in range(self.num_rows):
-            row: list[str] = []
-            for col_idx in range(self.num_cols):
-                location = Location(row_idx, col_idx)
-                if location in self.obstacles:
-                    row.append("#")
-                elif location == guard.location:
-                    row.append(guard.direction.value)
-                else:
-                    row.append(".")
-
-            row_strs.append("".join(row))
-        return "\n".join(row_strs)
-
-
-def parse_input(input: str) -> tuple[Area, GuardState]:
-    obstacles: set[Location] = set()
-    guard: GuardState | None = None
-    rows = input.split("\n")
-    for row_idx, row in enumerate(rows):
-        for col_idx, symbol in enumerate(row):
-            if symbol == "#":
-                obstacles.add(Location(row_idx, col_idx))
-            elif symbol == ".":
-                pass
-            else:
-                guard = GuardState(Location(row_idx, col_idx), Direction(symbol))
-
-    assert guard is not None
-    area = Area(len(rows), len(rows[0]), obstacles)
-    return area, guard
+import functools
+
+import parallel
+from grid import Grid
+
+OBSTACLE = ord("#")
+OUTSIDE = ord(" ")  # Grid border
+DIRECTIONS = "^>v<"  # Clockwise, matching Grid.orthogonal_offsets
+EXIT = -1  # Jump table entry when the guard walks off the map instead of hitting an obstacle
+
+# A loop check takes ~35us with jump tables, so a job needs thousands to pay for its process
+MIN_CANDIDATES_PER_JOB = 2000
+
+
+def parse_input(puzzle_input: str) -> tuple[Grid, int, int]:
+    """Returns the area, and the guard's position and direction"""
+    area = Grid.from_text(puzzle_input)
+    for direction, symbol in enumerate(DIRECTIONS):
+        if symbol in puzzle_input:
+            position = area.find(symbol)
+            area[position] = ord(".")
+            return area, position, direction
+    raise ValueError("Could not find the guard")
+
+
+def next_guard_state(area: Grid, position: int, direction: int) -> tuple[int, int]:
+    offsets = area.orthogonal_offsets
+    while area.cells[next_position := position + offsets[direction]] == OBSTACLE:
+        direction = (direction + 1) % 4
+    return next_position, direction
 
 
 def part_1(puzzle_input: str) -> str | int:
-    area, guard = parse_input(puzzle_input)
-    visited: set[Location] = set()
-    while area.is_in_bounds(guard.location):
-        visited.add(guard.location)
-        guard = area.next_guard_state(guard)
+    area, position, direction = parse_input(puzzle_input)
+    visited: set[int] = set()
+    while area.cells[position] != OUTSIDE:
+        visited.add(position)
+        position, direction = next_guard_state(area, position, direction)
     return len(visited)
 
 
-def has_loop(area: Area, guard: GuardState) -> bool:
-    seen: set[GuardState] = set()
-    while area.is_in_bounds(guard.location):
-        if guard in seen:
+def has_loop(area: Grid, position: int, direction: int) -> bool:
+    """Simulate the guard one step at a time (see JumpTable for the fast version)"""
+    seen: set[int] = set()
+    while area.cells[position] != OUTSIDE:
+        if (state := position * 4 + direction) in seen:
             return True
-        seen.add(guard)
-        guard = area.next_guard_state(guard)
+        seen.add(state)
+        position, direction = next_guard_state(area, position, direction)
     return False
 
 
+class JumpTable:
+    """
+    For every cell and direction, where the guard stops when walking in that direction:
+    the cell just before the next obstacle, or EXIT if they walk off the map.
+    The guard can then jump between turning points instead of walking cell by cell.
+    """
+
+    def __init__(self, area: Grid):
+        self.width = area.width
+        self.offsets = area.orthogonal_offsets
+        self.stops: list[list[int]] = []
+        for offset in self.offsets:
+            stops = [EXIT] * len(area.cells)
+            # Visit cells so that the cell in front of each one has already been filled in
+            indices = list(area.indices())
+            for position in reversed(indices) if offset > 0 else indices:
+                ahead = position + offset
+                if area.cells[ahead] == OBSTACLE:
+                    stops[position] = position
+                elif area.cells[ahead] != OUTSIDE:
+                    stops[position] = stops[ahead]
+            self.stops.append(stops)
+
+    def get_stop(self, position: int, direction: int, extra_obstacle: int) -> int:
+        """
+        Where the guard stops walking from position, with an extra obstacle patched in
+        The extra obstacle only matters if it lies on the guard's ray before the usual stop
+        """
+        stop = self.stops[direction][position]
+        offset = self.offsets[direction]
+        distance, remainder = divmod(extra_obstacle - position, offset)
+        if abs(offset) == 1 and (extra_obstacle // self.width != position // self.width):
+            return stop  # Not in the same row
+        if remainder != 0 or distance <= 0:
+            return stop  # Not in the same column, or behind the guard
+        if stop == EXIT or distance <= (stop - position) // offset:
+            return extra_obstacle - offset
+        return stop
+
+    def has_loop(self, position: int, direction: int, extra_obstacle: int) -> bool:
+        seen: set[int] = set()
+        while (position := self.get_stop(position, direction, extra_obstacle)) != EXIT:
+            if (state := position * 4 + direction) in seen:
+                return True
+            seen.add(state)
+            direction = (direction + 1) % 4
+        return False
+
+
+def get_candidates(area: Grid, position: int, direction: int) -> list[tuple[int, int, int]]:
+    """
+    Obstacle positions worth checking, each with the guard state just before reaching them
+    Only the first visit to each cell counts, since an obstacle there blocks the path earlier
+    """
+    candidates: list[tuple[int, int, int]] = []
+    visited: set[int] = {position}
+    while True:
+        next_position, next_direction = next_guard_state(area, position, direction)
+        if area.cells[next_position] == OUTSIDE:
+            return candidates
+        if next_position not in visited:
+            visited.add(next_position)
+            candidates.append((next_position, position, direction))
+        position, direction = next_position, next_direction
+
+
+def count_loops(area: Grid, candidates: list[tuple[int, int, int]]) -> int:
+    jump_table = JumpTable(area)
+    return sum(
+        jump_table.has_loop(position, direction, obstacle)
+        for obstacle, position, direction in candidates
+    )
+
+
+def count_loops_in_parallel(
+    area: Grid, candidates: list[tuple[int, int, int]], jobs: int | None = None
+) -> int:
+    count_chunk = functools.partial(count_loops, area)
+    return sum(parallel.map_in_chunks(count_chunk, candidates, MIN_CANDIDATES_PER_JOB, jobs))
+
+
 def part_2(puzzle_input: str) -> str | int:
-    area, guard = parse_input(puzzle_input)
-    looping_locations: set[Location] = set()
-    visited: set[Location] = set()
-    while area.is_in_bounds(guard.location):
-        visited.add(guard.location)
-        next_guard = area.next_guard_state(guard)
-        assert next_guard.location not in area.obstacles
-
-        # Check if putting obstacle in this locatio would result in a loop
-        if next_guard.location not in visited:
-            area.obstacles.add(next_guard.location)
-            if has_loop(area, guard):
-                looping_locations.add(next_guard.location)
-            area.obstacles.remove(next_guard.location)
-
-        guard = next_guard
-
-    return len(looping_locations)
+    area, position, direction = parse_input(puzzle_input)
+    return count_loops_in_parallel(area, get_candidates(area, position, direction))
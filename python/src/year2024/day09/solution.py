@@ -1,45 +1,4 @@
 from dataclasses import dataclass
-from heapq import heapify, heappop, heappush
-
-
-class ArrayDrive(list[int | None]):
-    """Simple array representation of hard drive"""
-
-    @classmethod
-    def from_input(cls, input: str) -> "ArrayDrive":
-        drive = cls()
-        for idx, digit in enumerate(map(int, input)):
-            if idx % 2 == 0:
-                file_idx = idx // 2
-                drive.extend([file_idx] * digit)
-            else:
-                drive.extend([None] * digit)
-        return drive
-
-    @property
-    def checksum(self) -> int:
-        total = 0
-        for idx, num in enumerate(self):
-            if num is not None:
-                total += idx * num
-        return total
-
-    def compress(self) -> None:
-        empty_idx = self.index(None)
-        move_idx = len(self) - 1
-        while move_idx > empty_idx:
-            if (move_elt := self[move_idx]) is not None:
-                self[empty_idx] = move_elt
-                self[move_idx] = None
-                empty_idx = self.index(None, empty_idx + 1)
-            move_idx -= 1
-        del self[empty_idx:]
-
-
-def part_1(puzzle_input: str) -> str | int:
-    drive = ArrayDrive.from_input(puzzle_input)
-    drive.compress()
-    return drive.checksum
 
 
 @dataclass
@@ -48,78 +7,129 @@ class File:
     size: int
     location: int
 
-
-class MapDrive:
-    # File sorted by IDs
-    files: list[File]
-    # Maps gap size (1-9) to a min heap of gap start indcies
-    _gaps: dict[int, list[int]]
-    # Indicates if compression has occurred
-    _compressed: bool
-
-    def __init__(self, puzzle_input: str):
-        # Build up files
-        location = 0
-        self.files = []
-        for idx, size in enumerate(map(int, puzzle_input)):
-            if idx % 2 == 0:
-                file_idx = idx // 2
-                self.files.append(File(id=idx // 2, size=size, location=location))
-
-            location += size
-
-        # Build up the gap index
-        self._gaps = {gap_size: [] for gap_size in range(1, 10)}
-        for file_idx in range(len(self.files) - 1):
-            gap_start = self.files[file_idx].location + self.files[file_idx].size
-            gap_size = self.files[file_idx + 1].location - gap_start
-            if gap_size > 0:
-                self._gaps[gap_size].append(gap_start)
-        for heap in self._gaps.values():
-            heapify(heap)
-
-        self._compressed = False
-
     @property
     def checksum(self) -> int:
-        total = 0
-        for f in self.files:
-            total += f.id * sum(range(f.location, f.location + f.size))
-        return total
-
-    def compress(self) -> None:
-        if self._compressed:
-            return None
-
-        # self.files is sorted by file ID
-        # Therefore, for uncompressed drives, it is also sorted by file location
-        for file_to_move in reversed(self.files):
-            candidate_gaps: set[tuple[int, int]] = set()  # Items are (location, gap_size)
-            for gap_size in range(file_to_move.size, 10):
-                if (
-                    self._gaps[gap_size]
-                    and (gap_location := self._gaps[gap_size][0]) < file_to_move.location
-                ):
-                    candidate_gaps.add((gap_location, gap_size))
-
-            if not candidate_gaps:
-                # Cannot move the file
-                continue
+        return get_checksum(self.id, self.location, self.size)
+
+
+def get_checksum(file_id: int, location: int, size: int) -> int:
+    """Checksum of a run of blocks, i.e. file_id * sum(range(location, location + size))"""
+    return file_id * size * (2 * location + size - 1) // 2
+
+
+def parse_input(puzzle_input: str) -> list[File]:
+    """Files sorted by ID (and therefore by location), the gaps are implied between them"""
+    location = 0
+    files: list[File] = []
+    for idx, size in enumerate(map(int, puzzle_input)):
+        if idx % 2 == 0:
+            files.append(File(id=idx // 2, size=size, location=location))
+        location += size
+    return files
+
+
+def get_gaps(files: list[File]) -> list[tuple[int, int]]:
+    """(location, size) of the space after each file but the last, sorted by location"""
+    return [
+        (file.location + file.size, next_file.location - file.location - file.size)
+        for file, next_file in zip(files, files[1:])
+    ]
+
+
+def compact_blocks(files: list[File]) -> int:
+    """
+    Move blocks one at a time from the end of the drive into the leftmost free space, and
+    return the checksum. Works on runs rather than blocks, so the drive is never expanded.
+    """
+    total = 0
+    tail = len(files) - 1  # The file we are currently moving blocks out of
+    tail_remaining = files[tail].size
+    for idx, file in enumerate(files):
+        if idx == tail:
+            total += get_checksum(file.id, file.location, tail_remaining)
+            break
+        total += file.checksum
+
+        # Fill the gap after this file with blocks from the end
+        gap_location = file.location + file.size
+        gap_size = files[idx + 1].location - gap_location
+        while gap_size and tail > idx:
+            num_moved = min(gap_size, tail_remaining)
+            total += get_checksum(files[tail].id, gap_location, num_moved)
+            gap_location += num_moved
+            gap_size -= num_moved
+            tail_remaining -= num_moved
+            if tail_remaining == 0:
+                tail -= 1
+                tail_remaining = files[tail].size
+
+        if tail <= idx:
+            break
+    return total
 
-            gap_location, gap_size = min(candidate_gaps)
 
-            # Move the file
-            file_to_move.location = gap_location
-
-            # Update gap data structure
-            heappop(self._gaps[gap_size])
-            if (residual_gap_size := gap_size - file_to_move.size) > 0:
-                heappush(self._gaps[residual_gap_size], gap_location + file_to_move.size)
-
-        self._compressed = True
+def part_1(puzzle_input: str) -> str | int:
+    return compact_blocks(parse_input(puzzle_input))
+
+
+class GapTree:
+    """
+    Segment tree over gaps sorted by location, where each node holds the largest gap size
+    in its subtree. Finding the leftmost gap of at least some size and shrinking a gap are
+    both O(log n).
+    """
+
+    def __init__(self, sizes: list[int]):
+        self._num_leaves = 1
+        while self._num_leaves < len(sizes):
+            self._num_leaves *= 2
+        self._max_sizes = [0] * (2 * self._num_leaves)
+        self._max_sizes[self._num_leaves : self._num_leaves + len(sizes)] = sizes
+        for node in range(self._num_leaves - 1, 0, -1):
+            self._max_sizes[node] = max(self._max_sizes[2 * node], self._max_sizes[2 * node + 1])
+
+    def find_leftmost(self, min_size: int) -> int | None:
+        """Index of the leftmost gap with at least min_size, if any"""
+        if self._max_sizes[1] < min_size:
+            return None
+        node = 1
+        while node < self._num_leaves:
+            node *= 2
+            if self._max_sizes[node] < min_size:
+                node += 1  # Nothing big enough on the left, so go right
+        return node - self._num_leaves
+
+    def update(self, index: int, size: int) -> None:
+        node = index + self._num_leaves
+        self._max_sizes[node] = size
+        while (node := node // 2) >= 1:
+            new_max = max(self._max_sizes[2 * node], self._max_sizes[2 * node + 1])
+            if self._max_sizes[node] == new_max:
+                break  # Nothing above here changes either
+            self._max_sizes[node] = new_max
+
+
+def compact_files(files: list[File]) -> None:
+    """Move whole files, highest ID first, into the leftmost gap that fits (if left of them)"""
+    gaps = get_gaps(files)
+    gap_locations = [location for location, _ in gaps]
+    gap_sizes = [size for _, size in gaps]
+    tree = GapTree(gap_sizes)
+
+    for file in reversed(files):
+        gap_idx = tree.find_leftmost(file.size)
+        if gap_idx is None or gap_locations[gap_idx] >= file.location:
+            # Cannot move the file
+            continue
+
+        # Move the file into the start of the gap, leaving any residual gap after it
+        file.location = gap_locations[gap_idx]
+        gap_locations[gap_idx] += file.size
+        gap_sizes[gap_idx] -= file.size
+        tree.update(gap_idx, gap_sizes[gap_idx])
 
 
 def part_2(puzzle_input: str) -> str | int:
-    drive = MapDrive(puzzle_input)
-    drive.compress()
-    return drive.checksum
+    files = parse_input(puzzle_input)
+    compact_files(files)
+    return sum(file.checksum for file in files)
@@ -1,3 +1,4 @@
+import math
 import operator
 import re
 from collections import defaultdict
@@ -5,6 +6,8 @@ from dataclasses import dataclass
 from functools import reduce
 from typing import DefaultDict
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class Vector:
@@ -70,14 +73,20 @@ def format_robots(robots: list[Robot], boundary: Vector) -> str:
 def part_2(puzzle_input: str) -> str | int:
     robots = [Robot.from_line(line) for line in puzzle_input.split("\n")]
     boundary = Vector(1 + max(r.position.x for r in robots), 1 + max(r.position.y for r in robots))
-
-    # Stop condition is when no robots overlap
-    num_steps = 0
-    while len({r.position for r in robots}) < len(robots):
-        for robot in robots:
-            robot.move(boundary, 1)
-        num_steps += 1
-
-    # Uncomment to see the tree
-    # print(format_robots(robots, boundary))
-    return num_steps
+    x = np.array([r.position.x for r in robots])
+    y = np.array([r.position.y for r in robots])
+    vx = np.array([r.velocity.x for r in robots])
+    vy = np.array([r.velocity.y for r in robots])
+
+    # Every robot is back where it started after lcm(width, height) seconds, so if no time in
+    # that first period has no overlapping robots, then no time ever does. Rather than moving
+    # robots one second at a time, jump straight to each time.
+    for num_steps in range(math.lcm(boundary.x, boundary.y)):
+        cells = (x + vx * num_steps) % boundary.x * boundary.y + (y + vy * num_steps) % boundary.y
+        if np.bincount(cells).max() == 1:
+            # To see the tree:
+            # for robot in robots:
+            #     robot.move(boundary, num_steps)
+            # print(format_robots(robots, boundary))
+            return num_steps
+    raise ValueError("Robots always overlap")
@@ -1,33 +1,29 @@
-def parse_input(puzzle_input: str) -> tuple[set[str], list[str]]:
-    """Returns set of available words and the list of goal patterns"""
-    word_line, _, *goal_patterns = puzzle_input.split("\n")
-    words = set(word_line.split(", "))
-    return words, goal_patterns
-
+from matcher import Matcher
 
-def get_num_partitions(goal: str, words: set[str], memo: dict[str, int]) -> int:
-    if goal in memo:
-        return memo[goal]
 
-    if not goal:
-        return 1
+def parse_input(puzzle_input: str) -> tuple[Matcher, list[str]]:
+    """Returns a matcher for the available words and the list of goal patterns"""
+    word_line, _, *goal_patterns = puzzle_input.split("\n")
+    return Matcher(set(word_line.split(", "))), goal_patterns
 
-    num_partitions = 0
-    for word in words:
-        if goal.startswith(word):
-            num_partitions += get_num_partitions(goal[len(word) :], words, memo)
 
-    memo[goal] = num_partitions
-    return num_partitions
+def get_num_partitions(goal: str, words: Matcher) -> int:
+    """
+    num_partitions[end] is the number of ways to make goal[:end], built up as the matcher finds
+    words in the order they end (so by the time a word ending at `end` is found, every word
+    ending at its start has already been counted)
+    """
+    num_partitions = [1] + [0] * len(goal)
+    for start, word_idx in words.find_all(goal):
+        num_partitions[start + words.lengths[word_idx]] += num_partitions[start]
+    return num_partitions[-1]
 
 
 def part_1(puzzle_input: str) -> str | int:
     words, goals = parse_input(puzzle_input)
-    memo: dict[str, int] = {}
-    return sum(1 for goal in goals if get_num_partitions(goal, words, memo))
+    return sum(1 for goal in goals if get_num_partitions(goal, words))
 
 
 def part_2(puzzle_input: str) -> str | int:
     words, goals = parse_input(puzzle_input)
-    memo: dict[str, int] = {}
-    return sum(get_num_partitions(goal, words, memo) for goal in goals)
+    return sum(get_num_partitions(goal, words) for goal in goals)
@@ -1,42 +1,74 @@
-from collections import defaultdict
-from typing import DefaultDict
+import numpy as np
+import numpy.typing as npt
 
 MODULO = 2**24
+NUM_STEPS = 2000
 
+# Price changes range over -9..9, so a window of four changes is a 4-digit base-19 number
+NUM_CHANGES = 19
+WINDOW_SIZE = 4
+NUM_WINDOWS = NUM_CHANGES**WINDOW_SIZE
 
-def get_next_secret(secret: int) -> int:
-    secret = (secret ^ (secret << 6)) % MODULO
-    secret = (secret ^ (secret >> 5)) % MODULO
-    secret = (secret ^ (secret << 11)) % MODULO
-    return secret
+Secrets = npt.NDArray[np.uint32]
 
 
-def process_secret(secret: int, bananas: DefaultDict[tuple[int, ...], int]) -> None:
-    seen: set[tuple[int, ...]] = set()
-    diffs: list[int] = []
-    for _ in range(2000):
-        next_secret = get_next_secret(secret)
-        diffs.append(next_secret % 10 - secret % 10)
-        diffs = diffs[-4:]  # Up to last for elements
-        if len(diffs) == 4:
-            diff_seq_key = tuple(diffs)
-            if diff_seq_key not in seen:
-                bananas[diff_seq_key] += next_secret % 10
-                seen.add(diff_seq_key)
-        secret = next_secret
+def get_secret_sequences(puzzle_input: str) -> Secrets:
+    """
+    Simulate every buyer at once, returning an array of shape (NUM_STEPS + 1, num_buyers)
+    Row i holds each buyer's secret after i steps
+    """
+    secret: Secrets = np.array(puzzle_input.split("\n"), dtype=np.uint32)
+    secrets = np.empty((NUM_STEPS + 1, len(secret)), dtype=np.uint32)
+    secrets[0] = secret
+    mask = np.uint32(MODULO - 1)
+    shifts = np.uint32(6), np.uint32(5), np.uint32(11)
+    for step in range(1, NUM_STEPS + 1):
+        # Bits shifted past the 32nd are dropped, which is harmless since we only keep 24 bits
+        secret ^= (secret << shifts[0]) & mask
+        secret ^= secret >> shifts[1]
+        secret ^= (secret << shifts[2]) & mask
+        secrets[step] = secret
+    return secrets
+
+
+def get_bananas_by_window(secrets: Secrets) -> npt.NDArray[np.int64]:
+    """
+    Total bananas bought for each window of four price changes, indexed by the window's
+    base-19 encoding, where each buyer only sells at the first occurrence of the window
+    """
+    prices = (secrets % 10).astype(np.int32)
+    changes = np.diff(prices, axis=0) + NUM_CHANGES // 2  # Shifted to 0..18
+
+    # windows[i] is the window of changes ending with the price at step i + WINDOW_SIZE
+    num_windows = len(changes) - WINDOW_SIZE + 1
+    windows = np.zeros((num_windows, changes.shape[1]), dtype=np.int32)
+    for offset in range(WINDOW_SIZE):
+        windows = windows * NUM_CHANGES + changes[offset : offset + num_windows]
+    sale_prices = prices[WINDOW_SIZE:]
+
+    # Mask out all but each buyer's first occurrence of each window. Laying windows out
+    # buyer by buyer in time order means np.unique's first index is the first occurrence.
+    # Keys stay in int32 (sorting faster than int64) unless there are over 16,000 buyers
+    num_buyers = windows.shape[1]
+    key_dtype = np.int32 if num_buyers * NUM_WINDOWS < 2**31 else np.int64
+    buyer_ids = np.arange(num_buyers, dtype=key_dtype)
+    buyer_windows = (buyer_ids * NUM_WINDOWS + windows.astype(key_dtype, copy=False)).T.ravel()
+    _, first_seen = np.unique(buyer_windows, return_index=True)
+
+    # np.bincount does the same as np.add.at into a zeroed array, but much faster
+    bananas = np.bincount(
+        windows.T.ravel()[first_seen],
+        weights=sale_prices.T.ravel()[first_seen],
+        minlength=NUM_WINDOWS,
+    )
+    return bananas.astype(np.int64)
 
 
 def part_1(puzzle_input: str) -> str | int:
-    total = 0
-    for secret in map(int, puzzle_input.split("\n")):
-        for _ in range(2000):
-            secret = get_next_secret(secret)
-        total += secret
-    return total
+    secrets = get_secret_sequences(puzzle_input)
+    return int(secrets[-1].sum(dtype=np.int64))
 
 
 def part_2(puzzle_input: str) -> str | int:
-    bananas: DefaultDict[tuple[int, ...], int] = defaultdict(int)
-    for secret in map(int, puzzle_input.split("\n")):
-        process_secret(secret, bananas)
-    return max(bananas.values())
+    secrets = get_secret_sequences(puzzle_input)
+    return int(get_bananas_by_window(secrets).max())
@@ -1,53 +1,88 @@
-from collections import defaultdict
-from typing import DefaultDict
+from collections.abc import Iterator
 
 
-def make_graph(edges: set[frozenset[str]]) -> dict[str, set[str]]:
-    graph: DefaultDict[str, set[str]] = defaultdict(set)
-    for a, b in edges:
-        graph[a].add(b)
-        graph[b].add(a)
-    return dict(graph)
+def iter_bits(bitset: int) -> Iterator[int]:
+    """Indices of the set bits, lowest first"""
+    while bitset:
+        lowest = bitset & -bitset
+        yield lowest.bit_length() - 1
+        bitset ^= lowest
 
 
-def find_cliques(
-    prior_cliques: set[frozenset[str]], graph: dict[str, set[str]]
-) -> set[frozenset[str]]:
-    """Given k-1 cliques, find k-cliques"""
-    cliques: set[frozenset[str]] = set()
-    for prior_clique in prior_cliques:
-        # Select an arbitrary node in prior_clique
-        excluded_node = next(iter(prior_clique))
-        for included_node in graph[excluded_node]:
-            if included_node in prior_clique:
-                continue
+class Graph:
+    """Undirected graph with nodes mapped to integer ids and adjacency stored as int bitsets"""
 
-            if prior_clique.difference({excluded_node}).union({included_node}) in prior_cliques:
-                cliques.add(prior_clique.union({included_node}))
+    def __init__(self, edges: list[tuple[str, str]]):
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+        self.adjacency: list[int] = []  # Bit j of adjacency[i] is set if i and j are connected
+        for a, b in edges:
+            a_id, b_id = self._get_id(a), self._get_id(b)
+            self.adjacency[a_id] |= 1 << b_id
+            self.adjacency[b_id] |= 1 << a_id
 
-    return cliques
+    @classmethod
+    def from_input(cls, puzzle_input: str) -> "Graph":
+        edges: list[tuple[str, str]] = []
+        for line in puzzle_input.split("\n"):
+            a, b = line.split("-")
+            edges.append((a, b))
+        return cls(edges)
 
+    def _get_id(self, name: str) -> int:
+        if (node_id := self.ids.get(name)) is None:
+            node_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.adjacency.append(0)
+        return node_id
 
-def find_max_clique(edges: set[frozenset[str]], graph: dict[str, set[str]]) -> frozenset[str]:
-    k_cliques = edges
-    while len(k_cliques) > 1:
-        k_cliques = find_cliques(k_cliques, graph)
+    def to_names(self, bitset: int) -> list[str]:
+        return [self.names[node_id] for node_id in iter_bits(bitset)]
 
-    if len(k_cliques) != 1:
-        raise ValueError("Max clique is not unique")
+    def find_triangles(self) -> Iterator[tuple[int, int, int]]:
+        """Every triangle exactly once, as ids a < b < c"""
+        for a, a_neighbors in enumerate(self.adjacency):
+            for b in iter_bits(a_neighbors >> (a + 1) << (a + 1)):
+                common = a_neighbors & self.adjacency[b]
+                for c in iter_bits(common >> (b + 1) << (b + 1)):
+                    yield a, b, c
 
-    return k_cliques.pop()
+    def find_max_clique(self) -> int:
+        """A maximum clique as a bitset of ids, using Bron-Kerbosch with pivoting"""
+        best = 0
+
+        def expand(clique: int, candidates: int, excluded: int) -> None:
+            nonlocal best
+            if not candidates and not excluded:
+                if clique.bit_count() > best.bit_count():
+                    best = clique
+                return
+            if clique.bit_count() + candidates.bit_count() <= best.bit_count():
+                return  # Can't beat the best clique found so far
+
+            # Any maximal clique contains the pivot or one of its non-neighbors, so only those
+            # need branching on. Pivot on the node with the most neighbors among the candidates.
+            pivot = max(
+                iter_bits(candidates | excluded),
+                key=lambda node: (self.adjacency[node] & candidates).bit_count(),
+            )
+            for node in iter_bits(candidates & ~self.adjacency[pivot]):
+                node_bit = 1 << node
+                neighbors = self.adjacency[node]
+                expand(clique | node_bit, candidates & neighbors, excluded & neighbors)
+                candidates &= ~node_bit
+                excluded |= node_bit
+
+        expand(0, (1 << len(self.names)) - 1, 0)
+        return best
 
 
 def part_1(puzzle_input: str) -> str | int:
-    edges = {frozenset(line.split("-")) for line in puzzle_input.split("\n")}
-    graph = make_graph(edges)
-    triangles = find_cliques(edges, graph)
-    return sum(1 for triangle in triangles if any(node.startswith("t") for node in triangle))
+    graph = Graph.from_input(puzzle_input)
+    is_t = [name.startswith("t") for name in graph.names]
+    return sum(1 for triangle in graph.find_triangles() if any(is_t[node] for node in triangle))
 
 
 def part_2(puzzle_input: str) -> str | int:
-    edges = {frozenset(line.split("-")) for line in puzzle_input.split("\n")}
-    graph = make_graph(edges)
-    max_clique = find_max_clique(edges, graph)
-    return ",".join(sorted(max_clique))
+    graph = Graph.from_input(puzzle_input)
+    return ",".join(sorted(graph.to_names(graph.find_max_clique())))